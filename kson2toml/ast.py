@@ -2,12 +2,33 @@
 
 from kson import KsonValue, KsonValueType
 from typing import Dict, List
-import textwrap
+import bisect
+import functools
+import itertools
+import os
+import re
+
+
+# Type bits used to classify array contents in one pass. Numbers share a bit,
+# and nested arrays are split by whether they hold tables.
+_KIND_STRING = 1
+_KIND_NUMBER = 2
+_KIND_BOOLEAN = 4
+_KIND_NULL = 8
+_KIND_TABLE = 16
+_KIND_ARRAY = 32
+_KIND_ARRAY_WITH_TABLES = 64
+_KIND_OTHER = 128
+_KIND_PRIMITIVES = _KIND_STRING | _KIND_NUMBER | _KIND_BOOLEAN | _KIND_NULL
+_KIND_ANY_ARRAY = _KIND_ARRAY | _KIND_ARRAY_WITH_TABLES
 
 
 class TomlNode:
     """Base class for all TOML AST nodes."""
     
+    __slots__ = ()
+    _KIND = _KIND_OTHER
+    
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
         raise NotImplementedError
 
@@ -15,72 +36,104 @@ class TomlNode:
 class TomlString(TomlNode):
     """String representation in TOML."""
     
+    __slots__ = ('value', 'allow_multiline')
+    _KIND = _KIND_STRING
+    
     def __init__(self, value: str, allow_multiline: bool = True):
         # Convert KSON whitespace escapes: $ + whitespace -> tab
-        value = value.replace('$ ', '\t').replace('$\t', '\t')
+        if '$' in value:
+            value = value.replace('$ ', '\t').replace('$\t', '\t')
         self.value = value
         self.allow_multiline = allow_multiline
     
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        has_real_newlines = '\n' in self.value
-        has_real_tabs = '\t' in self.value
+        quote, body = self._quoted_parts()
+        return f'{quote}{body}{quote}'
+    
+    def _quoted_parts(self, allow_multiline=None):
+        """Return the delimiter and the (escaped) body of the TOML string."""
+        if allow_multiline is None:
+            allow_multiline = self.allow_multiline
+        value = self.value
+        has_real_newlines = '\n' in value
+        has_real_tabs = '\t' in value
+        has_backslash = '\\' in value
+        has_double_quote = '"' in value
         
-        # Use triple-quoted strings for multiline content
-        if self.allow_multiline and (has_real_newlines or has_real_tabs) and len(self.value.strip()) > 0:
-            return f'"""{self.value}"""'
+        # Fast path: nothing to escape and nothing that calls for a multiline string
+        if not (has_real_newlines or has_real_tabs or has_backslash or has_double_quote):
+            return '"', value
         
-        has_single_quote = "'" in self.value
-        has_backslash = '\\' in self.value
-        has_double_quote = '"' in self.value
+        # Use triple-quoted strings for multiline content that is not just whitespace
+        if allow_multiline and (has_real_newlines or has_real_tabs) and not value.isspace():
+            return '"""', value
         
         # Use single quotes when content has backslashes and double quotes but no single quotes
-        if has_backslash and has_double_quote and not has_single_quote:
-            escaped = self.value.replace('\\', '\\\\')
-            return f"'{escaped}'"
+        if has_backslash and has_double_quote and "'" not in value:
+            return "'", value.replace('\\', '\\\\')
         
-        # Use double quotes by default, escaping in order: backslash, quotes, newlines
-        escaped = self.value.replace('\\', '\\\\').replace('"', '\\"')
-        if '\n' in escaped:
+        # Use double quotes by default, escaping in order: backslash, quotes, newlines.
+        # Each pass only runs when its character is present.
+        escaped = value
+        if has_backslash:
+            escaped = escaped.replace('\\', '\\\\')
+        if has_double_quote:
+            escaped = escaped.replace('"', '\\"')
+        if has_real_newlines:
             escaped = escaped.replace('\n', '\\n')
         
-        return f'"{escaped}"'
+        return '"', escaped
 
 
-class TomlInteger(TomlNode):
-    """Integer representation in TOML."""
+class _TomlNumber(TomlNode):
+    """Shared base of TomlInteger and TomlFloat."""
     
-    def __init__(self, value: int, literal: str = None):
+    __slots__ = ('value', 'literal', '_text')
+    _KIND = _KIND_NUMBER
+    
+    def __init__(self, value, literal: str = None):
         self.value = value
         self.literal = literal
+        # Output text, fixed at construction: the source literal, or str(value) without one
+        self._text = literal if literal else str(value)
     
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        return self.literal if self.literal else str(self.value)
+        return self._text
 
 
-class TomlFloat(TomlNode):
-    """Float/decimal representation in TOML."""
+class TomlInteger(_TomlNumber):
+    """Integer representation in TOML."""
     
-    def __init__(self, value: float, literal: str = None):
-        self.value = value
-        self.literal = literal
+    __slots__ = ()
+
+
+class TomlFloat(_TomlNumber):
+    """Float/decimal representation in TOML."""
     
-    def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        return self.literal if self.literal else str(self.value)
+    __slots__ = ()
 
 
 class TomlBoolean(TomlNode):
     """Boolean representation in TOML."""
     
+    __slots__ = ('value',)
+    _KIND = _KIND_BOOLEAN
+    # Output text indexed by the truthiness of the value
+    _OUT = ('false', 'true')
+    
     def __init__(self, value: bool):
         self.value = value
     
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        return 'true' if self.value else 'false'
+        return self._OUT[bool(self.value)]
 
 
 class TomlNull(TomlNode):
     """Null representation in TOML (converted to "null" string)."""
     
+    __slots__ = ()
+    _KIND = _KIND_NULL
+    
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
         return '"null"'
 
@@ -88,435 +141,570 @@ class TomlNull(TomlNode):
 class TomlArray(TomlNode):
     """Array representation in TOML."""
     
+    __slots__ = ('elements', 'start_line', 'end_line', '_mask')
+    _KIND = _KIND_ARRAY
+    
     def __init__(self, elements: List[TomlNode], start_line: int = None, end_line: int = None):
         self.elements = elements
         self.start_line = start_line
         self.end_line = end_line
+        # Nested arrays are built before their parent, so their masks are already
+        # set and each node's mask is computed once, bottom-up, without recursion
+        mask = 0
+        for elem in elements:
+            kind = elem._KIND
+            if kind == _KIND_ARRAY and elem._mask & _KIND_TABLE:
+                kind = _KIND_ARRAY_WITH_TABLES
+            mask |= kind
+        self._mask = mask
+    
+    def _type_mask(self) -> int:
+        """Return the OR of the ``_KIND`` bits of the elements.
+        
+        Computed at construction; elements are not modified afterwards.
+        """
+        return self._mask
     
     def check_heterogeneous(self) -> bool:
         """Check if array needs array-of-tables format (arrays-with-tables mixed with other types)."""
-        if not self.elements:
-            return False
-        
-        has_array_with_tables = False
-        has_other_types = False
-        
-        for elem in self.elements:
-            if isinstance(elem, TomlArray):
-                if any(isinstance(e, TomlTable) for e in elem.elements):
-                    has_array_with_tables = True
-                else:
-                    has_other_types = True
-            else:
-                has_other_types = True
-        
-        return has_array_with_tables and has_other_types
+        mask = self._type_mask()
+        return bool(mask & _KIND_ARRAY_WITH_TABLES and mask & ~_KIND_ARRAY_WITH_TABLES)
     
     def needs_array_of_tables_format(self) -> bool:
         """Check if array as root value needs array-of-tables format [[value]]."""
-        if not self.elements:
-            return False
-        
-        has_string = False
-        has_number = False
-        has_boolean = False
-        has_null = False
-        has_array = False
-        has_table = False
-        
-        for elem in self.elements:
-            if isinstance(elem, TomlString):
-                has_string = True
-            elif isinstance(elem, (TomlInteger, TomlFloat)):
-                has_number = True
-            elif isinstance(elem, TomlBoolean):
-                has_boolean = True
-            elif isinstance(elem, TomlNull):
-                has_null = True
-            elif isinstance(elem, TomlArray):
-                has_array = True
-            elif isinstance(elem, TomlTable):
-                has_table = True
-        
-        if has_array and (has_number or has_boolean or has_null or has_table):
+        mask = self._type_mask()
+        if mask & _KIND_ANY_ARRAY and mask & (_KIND_TABLE | _KIND_PRIMITIVES & ~_KIND_STRING):
             return True
         
-        primitive_types_count = sum([has_string, has_number, has_boolean, has_null])
-        return primitive_types_count >= 2
+        return (mask & _KIND_PRIMITIVES).bit_count() >= 2
     
     def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        if comments is None:
-            comments = {}
-        
-        if not self.elements:
-            return '[]'
-        
-        has_tables = any(isinstance(elem, TomlTable) for elem in self.elements)
-        has_arrays = any(isinstance(elem, TomlArray) for elem in self.elements)
-        
-        if has_tables:
-            elements_str = ', '.join(
-                elem.to_inline() if isinstance(elem, TomlTable) else elem.to_toml(indent_level, {}, source) 
-                for elem in self.elements
-            )
-            return f'[{elements_str}]'
-        
-        if has_arrays or len(self.elements) > 3 or comments:
-            return self._to_toml_multiline(indent_level, comments, source)
-        
-        elements_str = ', '.join(elem.to_toml(indent_level, {}, source) for elem in self.elements)
-        return f'[{elements_str}]'
-    
-    def _to_toml_multiline(self, indent_level, comments, source):
-        """Generate multiline array with comment handling."""
-        indent = '    ' * indent_level
-        next_indent = '    ' * (indent_level + 1)
-        lines = ['[']
-        
-        if source and comments:
-            sorted_comment_lines = sorted(comments.keys())
-            compact_mode = len(sorted_comment_lines) == 1 and sorted_comment_lines[0] == -1
-            elem_indent = indent if compact_mode else next_indent
-            consumed_comment_lines = set()
-            
-            for i, elem in enumerate(self.elements):
-                elem_comments = {}
-                if isinstance(elem, TomlArray) and elem.start_line is not None and elem.end_line is not None:
-                    for comment_line, comment_list in comments.items():
-                        if comment_line >= 0 and elem.start_line <= comment_line <= elem.end_line:
-                            elem_comments[comment_line] = comment_list
-                            consumed_comment_lines.add(comment_line)
-                
-                if i < len(sorted_comment_lines):
-                    line_num = sorted_comment_lines[i]
-                    if line_num not in consumed_comment_lines:
-                        comment_indent = indent if (line_num == -1 and compact_mode) else next_indent
-                        for comment in comments[line_num]:
-                            lines.append(f'{comment_indent}{comment}')
-                
-                elem_str = elem.to_toml(indent_level + 1 if not compact_mode else indent_level, elem_comments, source)
-                if i < len(self.elements) - 1:
-                    lines.append(f'{elem_indent}{elem_str},')
-                else:
-                    lines.append(f'{elem_indent}{elem_str}')
-            
-            if len(sorted_comment_lines) > len(self.elements):
-                for i in range(len(self.elements), len(sorted_comment_lines)):
-                    line_num = sorted_comment_lines[i]
-                    if line_num not in consumed_comment_lines:
-                        for comment in comments[line_num]:
-                            lines.append(f'{next_indent}{comment}')
-        else:
-            for i, elem in enumerate(self.elements):
-                elem_str = elem.to_toml(indent_level + 1, {}, source)
-                if i < len(self.elements) - 1:
-                    lines.append(f'{next_indent}{elem_str},')
-                else:
-                    lines.append(f'{next_indent}{elem_str}')
-        
-        lines.append(f'{indent}]')
-        return '\n'.join(lines)
+        buf = []
+        _emit_array(self, buf, indent_level, '', comments, source)
+        return ''.join(buf)
 
 
 class TomlTable(TomlNode):
     """Table/object representation in TOML."""
     
+    __slots__ = ('properties',)
+    _KIND = _KIND_TABLE
+    
     def __init__(self, properties: Dict[str, TomlNode]):
         self.properties = properties
     
     def to_inline(self) -> str:
         """Convert table to inline format {key = value}."""
-        items = []
-        for key, value in self.properties.items():
-            if ' ' in key or '-' in key or key in ['false', 'true', 'null']:
-                key_str = f'"{key}"'
-            else:
-                key_str = key
-            
-            value_str = value.to_toml(0)
-            items.append(f'{key_str} = {value_str}')
-        
-        return '{' + ', '.join(items) + '}'
+        buf = []
+        _emit_inline_table(self, buf)
+        return ''.join(buf)
     
     def to_toml(self, indent_level=0, table_path='', comments=None, source=None) -> str:
-        if comments is None:
-            comments = {}
-        
-        lines = []
+        buf = []
+        _emit_table(self, buf, indent_level, table_path, comments, source)
+        return ''.join(buf)
+    
+    def _to_toml_content(self, indent_level=0, table_path='', comments=None, source=None) -> str:
+        """Emit table content without the header."""
+        buf = []
+        _emit_table_body(self, buf, indent_level, table_path, comments, source)
+        return ''.join(buf)
+
+
+def _dedent(text):
+    """Same result as ``textwrap.dedent`` in one pass over the split lines, without regexes."""
+    lines = text.split('\n')
+    margin = None
+    changed = False
+    for i, line in enumerate(lines):
+        content = line.lstrip(' \t')
+        if not content:
+            # Whitespace-only lines are emptied and don't count toward the margin
+            if line:
+                lines[i] = ''
+                changed = True
+            continue
+        indent = line[:len(line) - len(content)]
+        if margin is None:
+            margin = indent
+        elif not indent.startswith(margin):
+            margin = os.path.commonprefix((margin, indent))
+    
+    if margin:
+        cut = len(margin)
+        lines = [line[cut:] for line in lines]
+    elif not changed:
+        return text
+    return '\n'.join(lines)
+
+
+class TomlEmbed(TomlNode):
+    """Embedded code block representation in TOML."""
+    
+    __slots__ = ('content', 'tag', 'metadata', 'has_escapes')
+    
+    def __init__(self, content: str, tag: str = None, metadata: str = None, has_escapes: bool = False):
+        self.content = content
+        self.tag = tag
+        self.metadata = metadata
+        self.has_escapes = has_escapes
+    
+    def to_toml(self, indent_level=0, comments=None, source=None) -> str:
+        content = self.content
         
-        # Build property comments map
-        property_comments = {k: [] for k in self.properties.keys()}
+        if not self.has_escapes:
+            content = _dedent(content)
         
-        if source and comments:
-            source_lines = source.split('\n')
-            key_line = {}
-            
-            for line_num, line in enumerate(source_lines):
-                stripped = line.strip()
-                if ':' in stripped and not stripped.startswith('#'):
-                    key_part = stripped.split(':', 1)[0].strip()
-                    if key_part.startswith('"') and key_part.endswith('"'):
-                        key_part = key_part[1:-1]
-                    if key_part in self.properties:
-                        key_line[key_part] = line_num
-            
-            # Build a list of (key, key_line_num) sorted by line number
-            # This allows us to find comments that are before a key
-            sorted_keys = sorted(key_line.items(), key=lambda x: x[1])
-            
-            for line_num, comment_list in comments.items():
-                # Find which key this comment belongs to
-                # It belongs to the first key that appears on or after this line
-                for k, k_line in sorted_keys:
-                    if line_num <= k_line:
-                        property_comments[k].extend(comment_list)
-                        break
+        # Escape backslashes to prevent invalid escape sequences
+        if '\\' in content:
+            content = content.replace('\\', '\\\\')
         
-        # Categorize properties while preserving order
-        items_with_types = []
-        for key, value in self.properties.items():
-            if isinstance(value, TomlTable):
-                item_type = 'nested_table'
-            elif isinstance(value, TomlArray) and any(isinstance(elem, TomlTable) for elem in value.elements):
-                item_type = 'nested_array'
+        newline = '' if content.endswith('\n') else '\n'
+        return f'"""\n{content}{newline}"""'
+
+
+# Serialization
+#
+# Every node is written into a single shared buffer of string fragments that
+# is joined once by the caller. ``_emit`` writes exactly the text the node's
+# ``to_toml`` would return; table emitters use the buffer length at their
+# entry point (``start``) to know whether they already produced a line.
+
+# Indentation prefixes for multiline arrays, one per nesting level
+_INDENTS = tuple('    ' * level for level in range(33))
+
+
+_RESERVED_KEYS = frozenset(('false', 'true', 'null'))
+
+
+# Keys made only of these characters can be written bare. TOML also allows
+# '-', but such keys have always been quoted and the expected output relies on it.
+_BARE_KEY = re.compile(r'[A-Za-z0-9_]+').fullmatch
+
+
+@functools.lru_cache(maxsize=4096)
+def _quote_key(key):
+    """Quote keys that are not valid TOML bare keys."""
+    if _BARE_KEY(key) and key not in _RESERVED_KEYS:
+        return key
+    if '\\' in key:
+        key = key.replace('\\', '\\\\')
+    if '"' in key:
+        key = key.replace('"', '\\"')
+    return f'"{key}"'
+
+
+def _line(out, start, text):
+    """Append ``text`` as a new line of the block that began at ``start``."""
+    if len(out) > start:
+        out.append('\n')
+    out.append(text)
+
+
+def _emit(node, out, indent_level=0, table_path='', comments=None, source=None):
+    """Write the TOML text of ``node`` into ``out``."""
+    emitter = _EMITTERS.get(type(node))
+    if emitter is None:
+        out.append(node.to_toml(indent_level, comments, source))
+    else:
+        emitter(node, out, indent_level, table_path, comments, source)
+
+
+def _emit_leaf(node, out, indent_level, table_path, comments, source):
+    out.append(node.to_toml(indent_level, comments, source))
+
+
+def _emit_string(node, out, indent_level, table_path, comments, source):
+    # Delimiters and body are separate fragments so large strings are not copied just to quote them
+    quote, body = node._quoted_parts()
+    out.append(quote)
+    out.append(body)
+    out.append(quote)
+
+
+# Numbers, booleans and null are written inline instead of through to_toml
+
+def _emit_number(node, out, indent_level, table_path, comments, source):
+    out.append(node._text)
+
+
+def _emit_boolean(node, out, indent_level, table_path, comments, source):
+    out.append(node._OUT[bool(node.value)])
+
+
+def _emit_null(node, out, indent_level, table_path, comments, source):
+    out.append('"null"')
+
+
+def _emit_array(node, out, indent_level, table_path, comments, source):
+    if comments is None:
+        comments = {}
+    
+    elements = node.elements
+    if not elements:
+        out.append('[]')
+        return
+    
+    mask = node._type_mask()
+    has_tables = mask & _KIND_TABLE
+    has_arrays = mask & _KIND_ANY_ARRAY
+    
+    if has_tables:
+        out.append('[')
+        for i, elem in enumerate(elements):
+            if i:
+                out.append(', ')
+            if elem._KIND == _KIND_TABLE:
+                _emit_inline_table(elem, out)
             else:
-                item_type = 'simple'
-            items_with_types.append((key, value, item_type))
-        
-        # Check if we have both simple and nested items
-        has_simple = any(t == 'simple' for _, _, t in items_with_types)
-        has_nested = any(t in ('nested_table', 'nested_array') for _, _, t in items_with_types)
-        
-        # Track if we've emitted the header for simple values
-        simple_section_header_emitted = False
-        # Track if we're in a context after array of tables (which will need section headers for embeds)
-        after_nested_array = False
+                _emit(elem, out, indent_level, '', {}, source)
+        out.append(']')
+        return
+    
+    if has_arrays or len(elements) > 3 or comments:
+        _emit_array_multiline(node, out, indent_level, comments, source)
+        return
+    
+    out.append('[')
+    for i, elem in enumerate(elements):
+        if i:
+            out.append(', ')
+        _emit(elem, out, indent_level, '', {}, source)
+    out.append(']')
+
+
+def _emit_array_multiline(node, out, indent_level, comments, source):
+    """Generate multiline array with comment handling."""
+    elements = node.elements
+    if indent_level + 1 < len(_INDENTS):
+        indent = _INDENTS[indent_level]
+        next_indent = _INDENTS[indent_level + 1]
+    else:
+        indent = '    ' * indent_level
+        next_indent = '    ' * (indent_level + 1)
+    out.append('[')
+    
+    if source and comments:
+        sorted_comment_lines = sorted(comments.keys())
+        compact_mode = len(sorted_comment_lines) == 1 and sorted_comment_lines[0] == -1
+        elem_indent = indent if compact_mode else next_indent
+        elem_level = indent_level if compact_mode else indent_level + 1
+        consumed_comment_lines = set()
+        last = len(elements) - 1
         
-        # Process items in original order
-        for idx, (key, value, item_type) in enumerate(items_with_types):
-            # Track if we just added a comment
-            has_comment_for_this_key = bool(property_comments[key])
+        for i, elem in enumerate(elements):
+            elem_comments = {}
+            if type(elem) is TomlArray and elem.start_line is not None and elem.end_line is not None:
+                # Comment lines inside the nested array's span, found on the sorted lines
+                low = bisect.bisect_left(sorted_comment_lines, max(elem.start_line, 0))
+                high = bisect.bisect_right(sorted_comment_lines, elem.end_line, low)
+                for comment_line in sorted_comment_lines[low:high]:
+                    elem_comments[comment_line] = comments[comment_line]
+                    consumed_comment_lines.add(comment_line)
             
-            # Add blank line after array of tables before next item
-            if idx > 0 and items_with_types[idx - 1][2] == 'nested_array' and lines and not property_comments[key]:
-                lines.append('')
+            if i < len(sorted_comment_lines):
+                line_num = sorted_comment_lines[i]
+                if line_num not in consumed_comment_lines:
+                    comment_indent = indent if (line_num == -1 and compact_mode) else next_indent
+                    for comment in comments[line_num]:
+                        out.append('\n')
+                        out.append(comment_indent)
+                        out.append(comment)
             
-            # Add blank line before comment if there's content and this is a comment
-            if property_comments[key] and lines:
-                lines.append('')
-            
-            for comment_text in property_comments[key]:
-                lines.append(comment_text)
-            
-            if item_type == 'simple':
-                # Emit table header before first simple value if there are nested structures
-                if not simple_section_header_emitted and table_path and not after_nested_array:
-                    # Add blank line before header if there's content already
-                    if lines and has_nested:
-                        lines.append('')
-                    lines.append(f'[{table_path}]')
-                    simple_section_header_emitted = True
-                
-                if isinstance(value, TomlEmbed) and key != 'embedContent':
-                    # Emit embed as a table (always, especially when it has a tag)
-                    full_path = f'{table_path}.{key}' if table_path else key
-                    # Don't add blank line if we just added a comment (comment already has spacing)
-                    if lines and not has_comment_for_this_key:
-                        lines.append('')
-                    lines.append(f'[{full_path}]')
-                    if value.tag:
-                        lines.append(f'embedTag = "{value.tag}"')
-                    lines.append(f'embedContent = {value.to_toml(indent_level, {}, source)}')
-                else:
-                    if key == 'embedContent' and isinstance(value, TomlString):
-                        value.allow_multiline = False
-                        value_str = value.to_toml(indent_level, {}, source)
-                        value.allow_multiline = True
-                    else:
-                        value_str = value.to_toml(indent_level, {}, source)
-                    
-                    if ' ' in key or '-' in key or key in ['false', 'true', 'null']:
-                        lines.append(f'"{key}" = {value_str}')
-                    else:
-                        lines.append(f'{key} = {value_str}')
-            
-            elif item_type == 'nested_table':
-                # Nested table
-                full_path = f'{table_path}.{key}' if table_path else key
-                if table_path:
-                    # If we have a parent table path, emit the header and content separately
-                    if lines:
-                        lines.append('')
-                    lines.append(f'[{full_path}]')
-                    nested_content = value._to_toml_content(0, full_path, {}, source)
-                    if nested_content:
-                        lines.append(nested_content)
-                else:
-                    # If no parent path (root level), let the nested table emit everything
-                    nested_output = value.to_toml(0, full_path, comments=comments, source=source)
-                    if lines:
-                        lines.append('')
-                    lines.append(nested_output)
-            
-            elif item_type == 'nested_array':
-                # Array of tables
-                for elem in value.elements:
-                    if isinstance(elem, TomlTable):
-                        full_path = f'{table_path}.{key}' if table_path else key
-                        if lines:
-                            lines.append('')
-                        lines.append(f'[[{full_path}]]')
-                        nested_content = elem._to_toml_content(0, full_path, comments, source)
-                        if nested_content:
-                            lines.append(nested_content)
-                # After emitting array of tables, mark that we're in post-array context
-                # and reset the header emission flag so subsequent simple values will re-emit [table_path]
-                after_nested_array = True
-                simple_section_header_emitted = False
+            out.append('\n')
+            out.append(elem_indent)
+            _emit(elem, out, elem_level, '', elem_comments, source)
+            if i < last:
+                out.append(',')
         
-        return '\n'.join(lines)
+        for line_num in sorted_comment_lines[len(elements):]:
+            if line_num not in consumed_comment_lines:
+                for comment in comments[line_num]:
+                    out.append('\n')
+                    out.append(next_indent)
+                    out.append(comment)
+    else:
+        # Separators are prebuilt so each element adds one fragment plus its value
+        append = out.append
+        emit = _emit
+        elem_level = indent_level + 1
+        separator = ',\n' + next_indent
+        append('\n' + next_indent)
+        for i, elem in enumerate(elements):
+            if i:
+                append(separator)
+            emit(elem, out, elem_level, '', {}, source)
     
-    def _to_toml_content(self, indent_level=0, table_path='', comments=None, source=None) -> str:
-        """Emit table content without the header."""
-        if comments is None:
-            comments = {}
+    out.append('\n' + indent + ']')
+
+
+def _emit_inline_table(node, out):
+    """Write ``node`` in inline format {key = value}."""
+    out.append('{')
+    for i, (key, value) in enumerate(node.properties.items()):
+        if i:
+            out.append(', ')
+        out.append(_quote_key(key))
+        out.append(' = ')
+        _emit(value, out, 0)
+    out.append('}')
+
+
+@functools.lru_cache(maxsize=8)
+def _source_keys(source):
+    """Return ``(line_num, key)`` for every source line that looks like a ``key: value`` pair.
+    
+    Tables of the same document share the result instead of re-scanning the source.
+    """
+    keys = []
+    for line_num, line in enumerate(source.split('\n')):
+        colon = line.find(':')
+        if colon < 0:
+            continue
+        stripped = line.lstrip()
+        if stripped.startswith('#'):
+            continue
+        key_part = line[:colon].strip()
+        if key_part.startswith('"') and key_part.endswith('"'):
+            key_part = key_part[1:-1]
+        keys.append((line_num, key_part))
+    return tuple(keys)
+
+
+def _property_comments(node, comments, source):
+    """Map each comment to the first property declared on or after its line.
+    
+    Only properties that receive comments get an entry.
+    """
+    property_comments = {}
+    
+    if source and comments:
+        properties = node.properties
+        key_line = {}
+        for line_num, key_part in _source_keys(source):
+            if key_part in properties:
+                key_line[key_part] = line_num
         
-        lines = []
+        # Keys sorted by line number; each line holds at most one key, so a
+        # binary search finds the first key on or after a comment's line
+        sorted_keys = sorted(key_line.items(), key=lambda x: x[1])
+        key_lines = [k_line for _, k_line in sorted_keys]
         
-        # Build property comments map
-        property_comments = {k: [] for k in self.properties.keys()}
+        for line_num, comment_list in comments.items():
+            index = bisect.bisect_left(key_lines, line_num)
+            if index < len(sorted_keys):
+                property_comments.setdefault(sorted_keys[index][0], []).extend(comment_list)
+    
+    return property_comments
+
+
+def _categorize_properties(node):
+    """Tag each property as 'simple', 'nested_table' or 'nested_array', preserving order."""
+    items_with_types = []
+    has_simple = False
+    has_nested = False
+    append = items_with_types.append
+    for key, value in node.properties.items():
+        value_type = type(value)
+        if value_type is TomlTable:
+            item_type = 'nested_table'
+            has_nested = True
+        elif value_type is TomlArray and value._type_mask() & _KIND_TABLE:
+            item_type = 'nested_array'
+            has_nested = True
+        else:
+            item_type = 'simple'
+            has_simple = True
+        append((key, value, item_type))
+    return items_with_types, has_simple, has_nested
+
+
+def _emit_simple_value(key, value, out, start, indent_level, source):
+    """Write a ``key = value`` line."""
+    _line(out, start, _quote_key(key))
+    out.append(' = ')
+    if key == 'embedContent' and value._KIND == _KIND_STRING:
+        # Embed content is always written as a single-line string
+        quote, body = value._quoted_parts(allow_multiline=False)
+        out.append(quote)
+        out.append(body)
+        out.append(quote)
+    else:
+        _emit(value, out, indent_level, '', {}, source)
+
+
+def _emit_embed_section(value, out, start, indent_level, full_path, source):
+    """Write an embed as its own ``[full_path]`` table."""
+    _line(out, start, f'[{full_path}]')
+    if value.tag:
+        _line(out, start, f'embedTag = "{value.tag}"')
+    _line(out, start, 'embedContent = ')
+    _emit(value, out, indent_level, '', {}, source)
+
+
+def _emit_section(out, start, header, table, full_path, comments, source):
+    """Write a ``header`` line followed by the body of ``table``, separated from previous content by a blank line."""
+    if len(out) > start:
+        out.append('\n')
+    _line(out, start, header)
+    out.append('\n')
+    mark = len(out)
+    _emit_table_body(table, out, 0, full_path, comments, source)
+    if len(out) == mark:
+        out.pop()
+
+
+def _emit_table(node, out, indent_level, table_path, comments, source):
+    if comments is None:
+        comments = {}
+    
+    start = len(out)
+    property_comments = _property_comments(node, comments, source)
+    items_with_types, has_simple, has_nested = _categorize_properties(node)
+    
+    # Track if we've emitted the header for simple values
+    simple_section_header_emitted = False
+    # Track if we're in a context after array of tables (which will need section headers for embeds)
+    after_nested_array = False
+    
+    # Process items in original order
+    for idx, (key, value, item_type) in enumerate(items_with_types):
+        key_comments = property_comments.get(key, ())
         
-        if source and comments:
-            source_lines = source.split('\n')
-            key_line = {}
-            
-            for line_num, line in enumerate(source_lines):
-                stripped = line.strip()
-                if ':' in stripped and not stripped.startswith('#'):
-                    key_part = stripped.split(':', 1)[0].strip()
-                    if key_part.startswith('"') and key_part.endswith('"'):
-                        key_part = key_part[1:-1]
-                    if key_part in self.properties:
-                        key_line[key_part] = line_num
-            
-            # Build a list of (key, key_line_num) sorted by line number
-            # This allows us to find comments that are before a key
-            sorted_keys = sorted(key_line.items(), key=lambda x: x[1])
-            
-            for line_num, comment_list in comments.items():
-                # Find which key this comment belongs to
-                # It belongs to the first key that appears on or after this line
-                for k, k_line in sorted_keys:
-                    if line_num <= k_line:
-                        property_comments[k].extend(comment_list)
-                        break
+        # Add blank line after array of tables before next item
+        if idx > 0 and items_with_types[idx - 1][2] == 'nested_array' and len(out) > start and not key_comments:
+            out.append('\n')
         
-        # Categorize properties while preserving order
-        items_with_types = []
-        for key, value in self.properties.items():
-            if isinstance(value, TomlTable):
-                item_type = 'nested_table'
-            elif isinstance(value, TomlArray) and any(isinstance(elem, TomlTable) for elem in value.elements):
-                item_type = 'nested_array'
-            else:
-                item_type = 'simple'
-            items_with_types.append((key, value, item_type))
+        # Add blank line before comment if there's content and this is a comment
+        if key_comments and len(out) > start:
+            out.append('\n')
         
-        # Track if we're in a context after array of tables
-        after_nested_array = False
+        for comment_text in key_comments:
+            _line(out, start, comment_text)
         
-        # Process items in original order
-        for idx, (key, value, item_type) in enumerate(items_with_types):
-            # Add blank line after array of tables before next item
-            if idx > 0 and items_with_types[idx - 1][2] == 'nested_array' and lines:
-                lines.append('')
-            
-            # Add blank line before comment if there's content and this is a comment
-            if property_comments[key] and lines:
-                lines.append('')
+        if item_type == 'simple':
+            # Emit table header before first simple value if there are nested structures
+            if not simple_section_header_emitted and table_path and not after_nested_array:
+                # Add blank line before header if there's content already
+                if len(out) > start and has_nested:
+                    out.append('\n')
+                _line(out, start, f'[{table_path}]')
+                simple_section_header_emitted = True
             
-            for comment_text in property_comments[key]:
-                lines.append(comment_text)
-            
-            if item_type == 'simple':
-                if isinstance(value, TomlEmbed) and key != 'embedContent':
-                    full_path = f'{table_path}.{key}' if table_path else key
-                    if lines:
-                        lines.append('')
-                    lines.append(f'[{full_path}]')
-                    if value.tag:
-                        lines.append(f'embedTag = "{value.tag}"')
-                    lines.append(f'embedContent = {value.to_toml(indent_level, {}, source)}')
-                else:
-                    # For regular simple values, if we're after arrays, emit table header first
-                    if after_nested_array and table_path:
-                        if lines:
-                            lines.append('')
-                        lines.append(f'[{table_path}]')
-                        after_nested_array = False
-                    
-                    if key == 'embedContent' and isinstance(value, TomlString):
-                        value.allow_multiline = False
-                        value_str = value.to_toml(indent_level, {}, source)
-                        value.allow_multiline = True
-                    else:
-                        value_str = value.to_toml(indent_level, {}, source)
-                    
-                    if ' ' in key or '-' in key or key in ['false', 'true', 'null']:
-                        lines.append(f'"{key}" = {value_str}')
-                    else:
-                        lines.append(f'{key} = {value_str}')
-            
-            elif item_type == 'nested_table':
-                # Nested table
+            if type(value) is TomlEmbed and key != 'embedContent':
+                # Emit embed as a table (always, especially when it has a tag)
                 full_path = f'{table_path}.{key}' if table_path else key
-                if lines:
-                    lines.append('')
-                lines.append(f'[{full_path}]')
-                nested_content = value._to_toml_content(0, full_path, {}, source)
-                if nested_content:
-                    lines.append(nested_content)
-            
-            elif item_type == 'nested_array':
-                # Array of tables
-                for elem in value.elements:
-                    if isinstance(elem, TomlTable):
-                        full_path = f'{table_path}.{key}' if table_path else key
-                        if lines:
-                            lines.append('')
-                        lines.append(f'[[{full_path}]]')
-                        nested_content = elem._to_toml_content(0, full_path, {}, source)
-                        if nested_content:
-                            lines.append(nested_content)
-                # Mark that we're after array of tables
-                after_nested_array = True
+                # Don't add blank line if we just added a comment (comment already has spacing)
+                if len(out) > start and not key_comments:
+                    out.append('\n')
+                _emit_embed_section(value, out, start, indent_level, full_path, source)
+            else:
+                _emit_simple_value(key, value, out, start, indent_level, source)
+        
+        elif item_type == 'nested_table':
+            # Nested table
+            full_path = f'{table_path}.{key}' if table_path else key
+            if table_path:
+                # If we have a parent table path, emit the header and content separately
+                _emit_section(out, start, f'[{full_path}]', value, full_path, {}, source)
+            else:
+                # If no parent path (root level), let the nested table emit everything
+                if len(out) > start:
+                    out.append('\n')
+                    out.append('\n')
+                _emit_table(value, out, 0, full_path, comments, source)
+                if len(out) == start:
+                    out.append('')
         
-        return '\n'.join(lines)
+        elif item_type == 'nested_array':
+            # Array of tables
+            full_path = f'{table_path}.{key}' if table_path else key
+            header = f'[[{full_path}]]'
+            for elem in value.elements:
+                if type(elem) is TomlTable:
+                    _emit_section(out, start, header, elem, full_path, comments, source)
+            # After emitting array of tables, mark that we're in post-array context
+            # and reset the header emission flag so subsequent simple values will re-emit [table_path]
+            after_nested_array = True
+            simple_section_header_emitted = False
 
 
-class TomlEmbed(TomlNode):
-    """Embedded code block representation in TOML."""
+def _emit_table_body(node, out, indent_level, table_path, comments, source):
+    """Emit table content without the header."""
+    if comments is None:
+        comments = {}
     
-    def __init__(self, content: str, tag: str = None, metadata: str = None, has_escapes: bool = False):
-        self.content = content
-        self.tag = tag
-        self.metadata = metadata
-        self.has_escapes = has_escapes
+    start = len(out)
+    property_comments = _property_comments(node, comments, source)
+    items_with_types, _, _ = _categorize_properties(node)
     
-    def to_toml(self, indent_level=0, comments=None, source=None) -> str:
-        content = self.content
+    # Track if we're in a context after array of tables
+    after_nested_array = False
+    
+    # Process items in original order
+    for idx, (key, value, item_type) in enumerate(items_with_types):
+        key_comments = property_comments.get(key, ())
         
-        if not self.has_escapes:
-            content = textwrap.dedent(content)
+        # Add blank line after array of tables before next item
+        if idx > 0 and items_with_types[idx - 1][2] == 'nested_array' and len(out) > start:
+            out.append('\n')
         
-        if not content.endswith('\n'):
-            content = content + '\n'
+        # Add blank line before comment if there's content and this is a comment
+        if key_comments and len(out) > start:
+            out.append('\n')
         
-        # Escape backslashes to prevent invalid escape sequences
-        content = content.replace('\\', '\\\\')
+        for comment_text in key_comments:
+            _line(out, start, comment_text)
         
-        return f'"""\n{content}"""'
+        if item_type == 'simple':
+            if type(value) is TomlEmbed and key != 'embedContent':
+                full_path = f'{table_path}.{key}' if table_path else key
+                if len(out) > start:
+                    out.append('\n')
+                _emit_embed_section(value, out, start, indent_level, full_path, source)
+            else:
+                # For regular simple values, if we're after arrays, emit table header first
+                if after_nested_array and table_path:
+                    if len(out) > start:
+                        out.append('\n')
+                    _line(out, start, f'[{table_path}]')
+                    after_nested_array = False
+                
+                _emit_simple_value(key, value, out, start, indent_level, source)
+        
+        elif item_type == 'nested_table':
+            # Nested table
+            full_path = f'{table_path}.{key}' if table_path else key
+            _emit_section(out, start, f'[{full_path}]', value, full_path, {}, source)
+        
+        elif item_type == 'nested_array':
+            # Array of tables
+            full_path = f'{table_path}.{key}' if table_path else key
+            header = f'[[{full_path}]]'
+            for elem in value.elements:
+                if type(elem) is TomlTable:
+                    _emit_section(out, start, header, elem, full_path, {}, source)
+            # Mark that we're after array of tables
+            after_nested_array = True
+
 
+_EMITTERS = {
+    TomlString: _emit_string,
+    TomlInteger: _emit_number,
+    TomlFloat: _emit_number,
+    TomlBoolean: _emit_boolean,
+    TomlNull: _emit_null,
+    TomlEmbed: _emit_leaf,
+    TomlArray: _emit_array,
+    TomlTable: _emit_table,
+}
+
+
+
+@functools.lru_cache(maxsize=8)
+def _line_offsets(source):
+    """Return the offset in ``source`` at which each line starts."""
+    return tuple(itertools.accumulate((len(line) + 1 for line in source.split('\n')), initial=0))
 
 
 def extract_literal_text(kson_value, tokens, source):
@@ -533,21 +721,8 @@ def extract_literal_text(kson_value, tokens, source):
         end_line = end_pos.line()
         end_col = end_pos.column()
         
-        lines = source.split('\n')
-        
-        if start_line == end_line:
-            return lines[start_line][start_col:end_col]
-        
-        result_lines = []
-        for line_num in range(start_line, end_line + 1):
-            line = lines[line_num]
-            if line_num == start_line:
-                result_lines.append(line[start_col:])
-            elif line_num == end_line:
-                result_lines.append(line[:end_col])
-            else:
-                result_lines.append(line)
-        return '\n'.join(result_lines)
+        offsets = _line_offsets(source)
+        return source[offsets[start_line] + start_col:offsets[end_line] + end_col]
     except (AttributeError, IndexError, Exception):
         return None
 
@@ -555,16 +730,25 @@ def extract_literal_text(kson_value, tokens, source):
 def extract_raw_embed_content(kson_value, tokens, source):
     """Extract embed content, converting escapes for simple content."""
     content = kson_value.content()
-    has_escapes = '%\\%' in content or '$\\$' in content or '\\' in content
+    # Both delimiter escapes contain a backslash, so one scan rules them all out
+    if '\\' not in content:
+        return content, False
+    has_escapes = True
     
-    if '%\\%' in content or '$\\$' in content:
+    has_percent_escape = '%\\%' in content
+    has_dollar_escape = '$\\$' in content
+    if has_percent_escape or has_dollar_escape:
         has_kson_structure = (
             ':\n' in content or ':\r' in content or ': ' in content or
             '\n$' in content or '\n%' in content
         )
         
         if not has_kson_structure:
-            content = content.replace('%\\%', '%%').replace('$\\$', '$$')
+            # Only unescape the delimiters that actually occur
+            if has_percent_escape:
+                content = content.replace('%\\%', '%%')
+            if has_dollar_escape:
+                content = content.replace('$\\$', '$$')
             has_escapes = False
     
     return content, has_escapes
@@ -574,10 +758,9 @@ def extract_comments_with_mapping(kson_string, tokens):
     """Extract and map comments from source code."""
     lines = kson_string.split('\n')
     
-    token_lines = []
-    for token in tokens:
-        if token.text() and token.text().strip():
-            token_lines.append(token.start().line())
+    # Without a '#' anywhere there is nothing to classify line by line
+    if '#' not in kson_string:
+        return {'leading': [], 'inline': {}, 'trailing': [], 'lines': lines}
     
     leading_comments = []
     inline_comments = {}
@@ -628,42 +811,108 @@ def extract_comments_with_mapping(kson_string, tokens):
     }
 
 
+# Leaf nodes are never mutated after construction, so booleans, null and
+# small integers (same range as CPython's int cache) share one node each
+_TRUE = TomlBoolean(True)
+_FALSE = TomlBoolean(False)
+_NULL = TomlNull()
+_SMALL_INTS = [TomlInteger(i, str(i)) for i in range(-5, 257)]
+
+
+def _string_to_ast(kson_value, tokens, source):
+    return TomlString(kson_value.value())
+
+
+def _integer_to_ast(kson_value, tokens, source):
+    value = kson_value.value()
+    literal = extract_literal_text(kson_value, tokens, source)
+    if -5 <= value <= 256:
+        cached = _SMALL_INTS[value + 5]
+        if literal == cached.literal:
+            return cached
+    return TomlInteger(value, literal)
+
+
+def _decimal_to_ast(kson_value, tokens, source):
+    literal = extract_literal_text(kson_value, tokens, source)
+    return TomlFloat(kson_value.value(), literal)
+
+
+def _boolean_to_ast(kson_value, tokens, source):
+    return _TRUE if kson_value.value() else _FALSE
+
+
+def _null_to_ast(kson_value, tokens, source):
+    return _NULL
+
+
+def _embed_to_ast(kson_value, tokens, source):
+    content, has_escapes = extract_raw_embed_content(kson_value, tokens, source)
+    return TomlEmbed(
+        content=content,
+        tag=kson_value.tag(),
+        metadata=kson_value.metadata(),
+        has_escapes=has_escapes
+    )
+
+
+# AST builder for each leaf KsonValueType (arrays and objects are handled by kson_value_to_ast)
+_AST_BUILDERS = {
+    KsonValueType.STRING: _string_to_ast,
+    KsonValueType.INTEGER: _integer_to_ast,
+    KsonValueType.DECIMAL: _decimal_to_ast,
+    KsonValueType.BOOLEAN: _boolean_to_ast,
+    KsonValueType.NULL: _null_to_ast,
+    KsonValueType.EMBED: _embed_to_ast,
+}
+
+
 def kson_value_to_ast(kson_value: KsonValue, tokens: List = None, source: str = None) -> TomlNode:
     """Convert KsonValue to TOML AST node."""
-    value_type = kson_value.value_type()
-    
-    if value_type == KsonValueType.STRING:
-        return TomlString(kson_value.value())
-    elif value_type == KsonValueType.INTEGER:
-        literal = extract_literal_text(kson_value, tokens, source)
-        return TomlInteger(kson_value.value(), literal)
-    elif value_type == KsonValueType.DECIMAL:
-        literal = extract_literal_text(kson_value, tokens, source)
-        return TomlFloat(kson_value.value(), literal)
-    elif value_type == KsonValueType.BOOLEAN:
-        return TomlBoolean(kson_value.value())
-    elif value_type == KsonValueType.NULL:
-        return TomlNull()
-    elif value_type == KsonValueType.ARRAY:
-        elements = [kson_value_to_ast(elem, tokens, source) for elem in kson_value.elements()]
-        start_line = kson_value.start().line() if kson_value.start() else None
-        end_line = kson_value.end().line() if kson_value.end() else None
-        return TomlArray(elements, start_line=start_line, end_line=end_line)
-    elif value_type == KsonValueType.OBJECT:
-        properties = {}
-        for key, value in kson_value.properties().items():
-            properties[key] = kson_value_to_ast(value, tokens, source)
-        return TomlTable(properties)
-    elif value_type == KsonValueType.EMBED:
-        content, has_escapes = extract_raw_embed_content(kson_value, tokens, source)
-        return TomlEmbed(
-            content=content,
-            tag=kson_value.tag(),
-            metadata=kson_value.metadata(),
-            has_escapes=has_escapes
-        )
-    else:
-        raise ValueError(f"Unsupported Kson value type: {value_type}")
+    root = [None]
+    
+    # Iterative post-order walk instead of recursion, so deep documents don't
+    # hit the recursion limit. Entries are (kson_value, container, slot, None)
+    # for values still to convert, and (node_class, container, slot, args) for
+    # arrays/objects, pushed below their children and built once they are done.
+    stack = [(kson_value, root, 0, None)]
+    push = stack.append
+    pop = stack.pop
+    builders = _AST_BUILDERS
+    array_type = KsonValueType.ARRAY
+    object_type = KsonValueType.OBJECT
+    while stack:
+        value, container, slot, args = pop()
+        if args is not None:
+            container[slot] = value(*args)
+            continue
+        
+        value_type = value.value_type()
+        # Leaves are the bulk of any document, so they are dispatched first
+        builder = builders.get(value_type)
+        if builder is not None:
+            container[slot] = builder(value, tokens, source)
+        elif value_type == array_type:
+            children = value.elements()
+            elements = [None] * len(children)
+            start = value.start()
+            end = value.end()
+            start_line = start.line() if start else None
+            end_line = end.line() if end else None
+            push((TomlArray, container, slot, (elements, start_line, end_line)))
+            for index, child in enumerate(children):
+                push((child, elements, index, None))
+        elif value_type == object_type:
+            children = value.properties()
+            # Keys are inserted up front so the table keeps the source order
+            properties = dict.fromkeys(children)
+            push((TomlTable, container, slot, (properties,)))
+            for key, child in children.items():
+                push((child, properties, key, None))
+        else:
+            raise ValueError(f"Unsupported Kson value type: {value_type}")
+    
+    return root[0]
 
 
 def kson_to_toml_string(kson_value: KsonValue, comment_map: Dict = None, source: str = None, tokens: List = None) -> str:
@@ -677,116 +926,153 @@ def kson_to_toml_string(kson_value: KsonValue, comment_map: Dict = None, source:
     inline_comments = comment_map.get('inline', {})
     trailing_comments = comment_map.get('trailing', [])
     
-    result_lines = []
+    # The whole document is written into one buffer and joined once
+    out = []
     
-    if not isinstance(ast_node, TomlTable):
-        result_lines.extend(_handle_non_table_root(ast_node, leading_comments, inline_comments, source))
+    if ast_node._KIND != _KIND_TABLE:
+        _handle_non_table_root(out, ast_node, leading_comments, inline_comments, source)
     else:
-        if leading_comments:
-            result_lines.extend(leading_comments)
-        result_lines.append(ast_node.to_toml(comments=inline_comments, source=source))
+        _emit_lines(out, leading_comments)
+        _emit_table_line(out, ast_node, inline_comments, source)
     
     if trailing_comments:
-        result_lines.append('')
-        result_lines.extend(trailing_comments)
+        _line(out, 0, '')
+        _emit_lines(out, trailing_comments)
+    
+    if not out:
+        return ''
     
-    return '\n'.join(result_lines).rstrip() + '\n' if result_lines else ''
+    # Trailing whitespace is trimmed on the last fragments, so the document is
+    # joined exactly once instead of joined, stripped and concatenated
+    while out and (not out[-1] or out[-1].isspace()):
+        out.pop()
+    if out:
+        out[-1] = out[-1].rstrip()
+    out.append('\n')
+    return ''.join(out)
+
+
+def _emit_lines(out, lines):
+    """Write each of ``lines`` as a root-level line."""
+    for text in lines:
+        _line(out, 0, text)
+
+
+def _emit_assignment(out, key, node, comments=None, source=None):
+    """Write a root-level ``key = value`` line."""
+    _line(out, 0, key)
+    out.append(' = ')
+    _emit(node, out, 0, '', comments, source)
 
 
-def _handle_non_table_root(ast_node, leading_comments, inline_comments, source):
+def _emit_table_line(out, node, comments=None, source=None):
+    """Write the full text of a table as a root-level line."""
+    if out:
+        out.append('\n')
+    start = len(out)
+    _emit_table(node, out, 0, '', comments, source)
+    if len(out) == start:
+        out.append('')
+
+
+def _handle_non_table_root(out, ast_node, leading_comments, inline_comments, source):
     """Handle root values that are not tables."""
-    lines = []
-    
-    if isinstance(ast_node, TomlArray) and ast_node.needs_array_of_tables_format():
-        if leading_comments:
-            lines.extend(leading_comments)
-        for elem in ast_node.elements:
-            lines.append('[[value]]')
-            lines.append(f'item = {elem.to_toml()}')
-            lines.append('')
-        if lines and lines[-1] == '':
-            lines.pop()
-    
-    elif isinstance(ast_node, TomlArray) and not ast_node.check_heterogeneous():
-        lines.extend(_handle_array_root(ast_node, leading_comments, inline_comments, source))
-    
-    elif isinstance(ast_node, TomlEmbed) and (ast_node.tag or ast_node.metadata):
-        if leading_comments:
-            lines.extend(leading_comments)
+    handler = _ROOT_HANDLERS.get(type(ast_node), _handle_value_root)
+    handler(out, ast_node, leading_comments, inline_comments, source)
+
+
+def _handle_any_array_root(out, ast_node, leading_comments, inline_comments, source):
+    """Handle an array as root value, choosing between array-of-tables and plain arrays."""
+    if ast_node.needs_array_of_tables_format():
+        _emit_lines(out, leading_comments)
+        for i, elem in enumerate(ast_node.elements):
+            if i:
+                _line(out, 0, '')
+            _line(out, 0, '[[value]]')
+            _emit_assignment(out, 'item', elem)
+    elif not ast_node.check_heterogeneous():
+        _handle_array_root(out, ast_node, leading_comments, inline_comments, source)
+    else:
+        _emit_lines(out, leading_comments)
+        _handle_heterogeneous_array(out, ast_node, inline_comments, source)
+
+
+def _handle_embed_root(out, ast_node, leading_comments, inline_comments, source):
+    """Handle an embed block as root value."""
+    if ast_node.tag or ast_node.metadata:
+        _emit_lines(out, leading_comments)
         tag_value = ast_node.tag if ast_node.tag else ast_node.metadata
         embed_table = TomlTable({'embedTag': TomlString(tag_value), 'embedContent': ast_node})
-        lines.append('[embedBlock]')
-        lines.append(embed_table.to_toml(comments=inline_comments, source=source))
-    
-    elif isinstance(ast_node, TomlEmbed):
-        if leading_comments:
-            lines.extend(leading_comments)
-            lines.append(f'value = {ast_node.to_toml(comments=inline_comments, source=source)}')
-        else:
-            lines.append(f'embedContent = {ast_node.to_toml(comments=inline_comments, source=source)}')
-    
-    elif isinstance(ast_node, TomlArray) and ast_node.check_heterogeneous():
-        if leading_comments:
-            lines.extend(leading_comments)
-        lines.extend(_handle_heterogeneous_array(ast_node, inline_comments, source))
-    
+        _line(out, 0, '[embedBlock]')
+        _emit_table_line(out, embed_table, inline_comments, source)
+    elif leading_comments:
+        _emit_lines(out, leading_comments)
+        _emit_assignment(out, 'value', ast_node, inline_comments, source)
     else:
-        if leading_comments:
-            lines.extend(leading_comments)
-        lines.append(f'value = {ast_node.to_toml(comments=inline_comments, source=source)}')
-    
-    return lines
+        _emit_assignment(out, 'embedContent', ast_node, inline_comments, source)
+
 
+def _handle_value_root(out, ast_node, leading_comments, inline_comments, source):
+    """Handle a scalar as root value."""
+    _emit_lines(out, leading_comments)
+    _emit_assignment(out, 'value', ast_node, inline_comments, source)
 
-def _handle_array_root(ast_node, leading_comments, inline_comments, source):
+
+def _handle_array_root(out, ast_node, leading_comments, inline_comments, source):
     """Handle regular array as root value."""
-    lines = []
-    has_nested_arrays = any(isinstance(elem, TomlArray) for elem in ast_node.elements)
+    # Common case: no comments to place, so none of the cascade applies
+    if not leading_comments and not inline_comments:
+        _emit_assignment(out, 'value', ast_node, inline_comments, source)
+        return
+    
+    has_nested_arrays = ast_node._type_mask() & _KIND_ANY_ARRAY
+    leading_count = len(leading_comments) if leading_comments else 0
     inline_comment_count = len(inline_comments) if inline_comments else 0
     
-    if leading_comments and has_nested_arrays and inline_comments and inline_comment_count >= 2:
-        lines.extend(leading_comments)
-        lines.append(f'value = {ast_node.to_toml(comments=inline_comments, source=source)}')
-    elif leading_comments and len(leading_comments) >= 2 and inline_comments:
+    if leading_count and has_nested_arrays and inline_comment_count >= 2:
+        _emit_lines(out, leading_comments)
+        _emit_assignment(out, 'value', ast_node, inline_comments, source)
+    elif leading_count >= 2 and inline_comment_count:
         outer_leading = leading_comments[:-1]
         inner_leading = [leading_comments[-1]]
-        lines.extend(outer_leading)
+        _emit_lines(out, outer_leading)
         combined_comments = {-1: inner_leading}
         combined_comments.update(inline_comments)
-        lines.append(f'value = {ast_node.to_toml(comments=combined_comments, source=source)}')
-    elif leading_comments:
+        _emit_assignment(out, 'value', ast_node, combined_comments, source)
+    elif leading_count:
         combined_comments = {-1: leading_comments}
-        if inline_comments:
+        if inline_comment_count:
             combined_comments.update(inline_comments)
-        lines.append(f'value = {ast_node.to_toml(comments=combined_comments, source=source)}')
+        _emit_assignment(out, 'value', ast_node, combined_comments, source)
     else:
-        lines.append(f'value = {ast_node.to_toml(comments=inline_comments, source=source)}')
-    
-    return lines
+        _emit_assignment(out, 'value', ast_node, inline_comments, source)
 
 
-def _handle_heterogeneous_array(ast_node, inline_comments, source):
+def _handle_heterogeneous_array(out, ast_node, inline_comments, source):
     """Handle heterogeneous array (mixed types) as root value."""
-    lines = []
-    has_arrays = any(isinstance(elem, TomlArray) for elem in ast_node.elements)
-    has_tables = any(isinstance(elem, TomlTable) for elem in ast_node.elements)
-    key_name = 'list_item' if (has_arrays or has_tables) else 'item'
+    key_name = 'list_item' if ast_node._type_mask() & (_KIND_ANY_ARRAY | _KIND_TABLE) else 'item'
+    nested_header = f'[[value.{key_name}]]'
     
     for elem in ast_node.elements:
-        lines.append('[[value]]')
-        if isinstance(elem, TomlTable):
-            lines.append(elem.to_toml(comments=inline_comments, source=source))
-        elif isinstance(elem, TomlArray):
-            has_inner_tables = any(isinstance(e, TomlTable) for e in elem.elements)
-            if has_inner_tables:
+        _line(out, 0, '[[value]]')
+        elem_kind = elem._KIND
+        if elem_kind == _KIND_TABLE:
+            _emit_table_line(out, elem, inline_comments, source)
+        elif elem_kind == _KIND_ARRAY:
+            if elem._type_mask() & _KIND_TABLE:
                 for table_elem in elem.elements:
-                    if isinstance(table_elem, TomlTable):
-                        lines.append(f'[[value.{key_name}]]')
-                        lines.append(table_elem.to_toml(comments=inline_comments, source=source))
+                    if table_elem._KIND == _KIND_TABLE:
+                        _line(out, 0, nested_header)
+                        _emit_table_line(out, table_elem, inline_comments, source)
             else:
-                lines.append(f'{key_name} = {elem.to_toml(comments=inline_comments, source=source)}')
+                _emit_assignment(out, key_name, elem, inline_comments, source)
         else:
-            lines.append(f'{key_name} = {elem.to_toml(comments=inline_comments, source=source)}')
-        lines.append('')
-    
-    return lines
\ No newline at end of file
+            _emit_assignment(out, key_name, elem, inline_comments, source)
+        _line(out, 0, '')
+
+
+# Root handler for each non-table node type; scalars use _handle_value_root
+_ROOT_HANDLERS = {
+    TomlArray: _handle_any_array_root,
+    TomlEmbed: _handle_embed_root,
+}
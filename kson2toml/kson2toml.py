@@ -1,25 +1,52 @@
 """
 Documentation for the Kson2toml converter.
 """
+import functools
+
 from kson import Kson
 from kson2toml.ast import kson_to_toml_string, extract_comments_with_mapping
 
+# Se resuelve una sola vez en lugar de en cada conversión
+_analyze = Kson.analyze
+
+
+class KsonParseError(ValueError):
+    """
+    Error de parseo de Kson
+    
+    Conserva los mensajes del analizador en ``errors`` como cadenas, de modo que la
+    excepción se puede serializar con pickle.
+    """
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        error_messages = '\n'.join(f"Error: {message}" for message in self.errors)
+        super().__init__(f"Failed to parse Kson:\n{error_messages}")
+
+    def __reduce__(self):
+        return (type(self), (self.errors,))
+
+
+@functools.lru_cache(maxsize=256)
 def kson2toml(kson_string):
     """
     Lógica de conversión de Kson a Toml
     
+    Los resultados se guardan en caché por cadena de entrada; ``kson2toml.__wrapped__``
+    convierte sin pasar por la caché.
+    
     :param kson_string: La cadena completa en formato Kson
 
     :return toml_string: Conversión completa a cadena Toml
+
+    :raises KsonParseError: Si la cadena no es Kson válido (subclase de ValueError)
     """
-    a = Kson.analyze(kson_string)
+    a = _analyze(kson_string)
     kson_value = a.kson_value()
     
     if kson_value is None:
         # Si hay errores de parseo
-        errors = a.errors()
-        error_messages = '\n'.join([f"Error: {err.message()}" for err in errors])
-        raise ValueError(f"Failed to parse Kson:\n{error_messages}")
+        raise KsonParseError([err.message() for err in a.errors()])
     
     # Extraer comentarios del código fuente con mapeo mejorado
     tokens = a.tokens()
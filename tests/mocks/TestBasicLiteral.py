@@ -1,20 +1,22 @@
-testBooleanLiteralSourceTrue = {
-    "ksonsource": """true""",
-    "tomlexpected": """value = true"""
-}
+from tests.mocks._case import TestCase
 
-testBooleanLiteralSourceFalse = {
-    "ksonsource": """false""",
-    "tomlexpected": """value = false"""
-}
+testBooleanLiteralSourceTrue = TestCase(
+    ksonsource="""true""",
+    tomlexpected="""value = true"""
+)
 
-testNullLiteralSource = {
-    "ksonsource": """null""",
-    "tomlexpected": """value = "null\""""
-}
+testBooleanLiteralSourceFalse = TestCase(
+    ksonsource="""false""",
+    tomlexpected="""value = false"""
+)
 
-all_tests = [
+testNullLiteralSource = TestCase(
+    ksonsource="""null""",
+    tomlexpected="""value = "null\""""
+)
+
+all_tests = (
     testBooleanLiteralSourceTrue,
     testBooleanLiteralSourceFalse,
     testNullLiteralSource
-]
\ No newline at end of file
+)
\ No newline at end of file
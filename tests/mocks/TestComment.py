@@ -1,27 +1,29 @@
-testSourceWithComment = {
-    "ksonsource": """
+from tests.mocks._case import TestCase
+
+testSourceWithComment = TestCase(
+    ksonsource="""
         # this is a comment
         string
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # this is a comment
         value = "string"
     """
-}
+)
 
-testSanityCheckCommentFreeCompiles = {
-    "ksonsource": """
+testSanityCheckCommentFreeCompiles = TestCase(
+    ksonsource="""
         key:
             value: 42
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [key]
         value = 42
     """
-}
+)
 
-testCommentPreservationOnDashLists = {
-    "ksonsource": """
+testCommentPreservationOnDashLists = TestCase(
+    ksonsource="""
         # comment one
         - one
         # comment two
@@ -30,7 +32,7 @@ testCommentPreservationOnDashLists = {
         # comment three.2
         - three
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             # comment one
             "one",
@@ -41,17 +43,17 @@ testCommentPreservationOnDashLists = {
             "three"
         ]
     """
-}
+)
 
-testMultipleCommentsOnNestedElements = {
-    "ksonsource": """
+testMultipleCommentsOnNestedElements = TestCase(
+    ksonsource="""
         # first comment
         # second comment
         # third comment
         - one
         - two
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
         # first comment
         # second comment
@@ -60,136 +62,136 @@ testMultipleCommentsOnNestedElements = {
         "two"
         ]
     """
-}
+)
 
-testCommentPreservationOnConstants = {
-    "ksonsource": """
+testCommentPreservationOnConstants = TestCase(
+    ksonsource="""
         # comment on a number
         4.5
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # comment on a number
         value = 4.5
     """
-}
+)
 
-testCommentPreservationOnConstants_2 = {
-    "ksonsource": """
+testCommentPreservationOnConstants_2 = TestCase(
+    ksonsource="""
         # comment on a boolean
         false
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # comment on a boolean
         value = false
     """
-}
+)
 
-testCommentPreservationOnConstants_3 = {
-    "ksonsource": """
+testCommentPreservationOnConstants_3 = TestCase(
+    ksonsource="""
         # comment on an identifier
         id
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # comment on an identifier
         value = "id"
     """
-}
+)
 
-testCommentPreservationOnConstants_4 = {
-    "ksonsource": """
+testCommentPreservationOnConstants_4 = TestCase(
+    ksonsource="""
         # comment on a string
         'a string'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # comment on a string
         value = "a string"
     """
-}
+)
 
-testTrailingCommentPreservationOnConstants = {
-    "ksonsource": """
+testTrailingCommentPreservationOnConstants = TestCase(
+    ksonsource="""
         # trailing comment
         4.5
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # trailing comment
         value = 4.5
     """
-}
+)
 
-testTrailingCommentPreservationOnConstants_2 = {
-    "ksonsource": """
+testTrailingCommentPreservationOnConstants_2 = TestCase(
+    ksonsource="""
         # trailing comment
         false
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # trailing comment
         value = false
     """
-}
+)
 
-testTrailingCommentPreservationOnConstants_3 = {
-    "ksonsource": """
+testTrailingCommentPreservationOnConstants_3 = TestCase(
+    ksonsource="""
         id # trailing comment
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # trailing comment
         value = "id"
     """
-}
+)
 
-testTrailingCommentPreservationOnConstants_4 = {
-    "ksonsource": """
+testTrailingCommentPreservationOnConstants_4 = TestCase(
+    ksonsource="""
         # trailing comment
         'a string'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # trailing comment
         value = "a string"
     """
-}
+)
 
-testCommentPreservationOnObjects = {
-    "ksonsource": """
+testCommentPreservationOnObjects = TestCase(
+    ksonsource="""
         # a comment
         # an odd but legal comment on this val
         key: val
         # another comment
         key2: val2
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # a comment
         # an odd but legal comment on this val
         key = "val"
         # another comment
         key2 = "val2"
     """
-}
+)
 
-testCommentsPreservationOnCommas = {
-    "ksonsource": """
+testCommentsPreservationOnCommas = TestCase(
+    ksonsource="""
         # this comment should be preserved on this property
         key1: val1
         # as should this one
         key2: val2
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # this comment should be preserved on this property
         key1 = "val1"
         # as should this one
         key2 = "val2"
     """
-}
+)
 
-testCommentPreservationOnLists = {
-    "ksonsource": """
+testCommentPreservationOnLists = TestCase(
+    ksonsource="""
         # comment on list
         # comment on first_element
         - first_element
         # comment on second_element
         - second_element
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # comment on list
         value = [
             # comment on first_element
@@ -198,16 +200,16 @@ testCommentPreservationOnLists = {
             "second_element"
         ]
     """
-}
+)
 
-testCommentPreservationOnLists_2 = {
-    "ksonsource": """
+testCommentPreservationOnLists_2 = TestCase(
+    ksonsource="""
         # comment on first_element
         - first_element
         # comment on second_element
         - second_element
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             # comment on first_element
             "first_element",
@@ -215,10 +217,10 @@ testCommentPreservationOnLists_2 = {
             "second_element"
         ]
     """
-}
+)
 
-testCommentPreservationOnLists_3 = {
-    "ksonsource": """
+testCommentPreservationOnLists_3 = TestCase(
+    ksonsource="""
         # a list of lists
         - 
         # trailing comment on constant element
@@ -243,7 +245,7 @@ testCommentPreservationOnLists_3 = {
             - 9.2
             - 8.2
     """,
-    "tomlexpected": """
+    tomlexpected="""
     # a list of lists
     value = [
         [
@@ -267,25 +269,25 @@ testCommentPreservationOnLists_3 = {
         ]
     ]
     """
-}
+)
 
-testCommentPreservationOnEmbedBlocks = {
-    "ksonsource": """
+testCommentPreservationOnEmbedBlocks = TestCase(
+    ksonsource="""
         # a comment on an embed block
         %
         embedded stuff
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         # a comment on an embed block
         value = """
         embedded stuff
         """
     '''
-}
+)
 
-testTrailingCommentOnLists = {
-    "ksonsource": """
+testTrailingCommentOnLists = TestCase(
+    ksonsource="""
         # leading
         # trailing list brace
         # trailing "one"
@@ -293,7 +295,7 @@ testTrailingCommentOnLists = {
         # trailing "two"
         - two
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # leading
         # trailing list brace
         value = [
@@ -303,36 +305,36 @@ testTrailingCommentOnLists = {
             "two"
         ]
     """
-}
+)
 
-testTrailingCommentsInObjects = {
-    "ksonsource": """
+testTrailingCommentsInObjects = TestCase(
+    ksonsource="""
         # leading
         # trailing
         keyword: value
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # leading
         # trailing
         keyword = "value"
     """
-}
+)
 
-testTrailingCommentsInObjects_2 = {
-    "ksonsource": """
+testTrailingCommentsInObjects_2 = TestCase(
+    ksonsource="""
         # leading
         # trailing
         keyword: value
     """,
-    "tomlexpected": """
+    tomlexpected="""
         # leading
         # trailing
         keyword = "value"
     """
-}
+)
 
-testDocumentEndComments = {
-    "ksonsource": """
+testDocumentEndComments = TestCase(
+    ksonsource="""
         null
         
         # these are some trailing
@@ -340,7 +342,7 @@ testDocumentEndComments = {
         # to be preserved at the end
         # of the file
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "null"
         
         # these are some trailing
@@ -348,9 +350,9 @@ testDocumentEndComments = {
         # to be preserved at the end
         # of the file
     """
-}
+)
 
-all_tests = [
+all_tests = (
     testSourceWithComment,
     testSanityCheckCommentFreeCompiles,
     testCommentPreservationOnDashLists,
@@ -373,4 +375,4 @@ all_tests = [
     testTrailingCommentsInObjects,
     testTrailingCommentsInObjects_2,
     testDocumentEndComments
-]
\ No newline at end of file
+)
\ No newline at end of file
@@ -1,233 +1,235 @@
-testEmbedBlockSource = {
-    "ksonsource": """
+from tests.mocks._case import TestCase
+
+testEmbedBlockSource = TestCase(
+    ksonsource="""
         %
             this is a raw embed
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         embedContent = """
         this is a raw embed
         """
     '''
-}
+)
 
-testEmbedBlockSource_2 = {
-    "ksonsource": """
+testEmbedBlockSource_2 = TestCase(
+    ksonsource="""
         %sql
             select * from something
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "sql"
         embedContent = """
         select * from something
         """
     '''
-}
+)
 
-testEmbedBlockSource_3 = {
-    "ksonsource": """
+testEmbedBlockSource_3 = TestCase(
+    ksonsource="""
         %sql: database
             select * from something
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "sql"
         embedContent = """
         select * from something
         """
     '''
-}
+)
 
-testEmbedBlockSource_4 = {
-    "ksonsource": """
+testEmbedBlockSource_4 = TestCase(
+    ksonsource="""
         %sql: ::::::::::::database::::::
             select * from something
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "sql"
         embedContent = """
         select * from something
         """
     '''
-}
+)
 
-testEmbedBlockWithAlternativeDelimiters = {
-    "ksonsource": """
+testEmbedBlockWithAlternativeDelimiters = TestCase(
+    ksonsource="""
         %
             this is a raw embed with alternative delimiter
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         embedContent = """
         this is a raw embed with alternative delimiter
         """
     '''
-}
+)
 
-testEmbedBlockWithAlternativeDelimiters_2 = {
-    "ksonsource": """
+testEmbedBlockWithAlternativeDelimiters_2 = TestCase(
+    ksonsource="""
         %sql
             select * from something
         %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "sql"
         embedContent = """
         select * from something
         """
     '''
-}
+)
 
-testEmbedBlockWithEscapes = {
-    "ksonsource": """
+testEmbedBlockWithEscapes = TestCase(
+    ksonsource="""
     %
     this is an escaped delim %\%
     whereas in this case, this is not $\$
     %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
     embedContent = """
     this is an escaped delim %%
     whereas in this case, this is not $$
     """
     '''
-}
+)
 
-testEmbedBlockWithEscapes_2 = {
-    "ksonsource": """
+testEmbedBlockWithEscapes_2 = TestCase(
+    ksonsource="""
     $
     more %% %% %% than $\$ should yield a $\$-delimited block
     $$
     """,
-    "tomlexpected": '''
+    tomlexpected='''
     embedContent = """
     more %% %% %% than $$ should yield a $$-delimited block
     """
     '''
-}
+)
 
-testEmbedBlockWithAlternativeDelimiterAndEscapes = {
-    "ksonsource": """
+testEmbedBlockWithAlternativeDelimiterAndEscapes = TestCase(
+    ksonsource="""
     $
     these double $\$ dollars are %%%% embedded but escaped
     $$
     """,
-    "tomlexpected": '''
+    tomlexpected='''
     embedContent = """
     these double $$ dollars are %%%% embedded but escaped
     """
     '''
-}
+)
 
-testEmbedBlockEndingInSlash = {
-    "ksonsource": """
+testEmbedBlockEndingInSlash = TestCase(
+    ksonsource="""
         %
         %\%%
     """,
-    "tomlexpected": '''embedContent = """
+    tomlexpected='''embedContent = """
 %\\\\
 """'''
-}
+)
 
-testEmbedBlockTagsRetainment = {
-    "ksonsource": """
+testEmbedBlockTagsRetainment = TestCase(
+    ksonsource="""
         %
         content%%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         embedContent = """
         content
         """
     '''
-}
+)
 
-testEmbedBlockTagsRetainment_2 = {
-    "ksonsource": """
+testEmbedBlockTagsRetainment_2 = TestCase(
+    ksonsource="""
         %sql
         content%%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "sql"
         embedContent = """
         content
         """
     '''
-}
+)
 
-testEmbedBlockTagsRetainment_3 = {
-    "ksonsource": """
+testEmbedBlockTagsRetainment_3 = TestCase(
+    ksonsource="""
         %: meta
         content%%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedTag = "meta"
         embedContent = """
         content
         """
     '''
-}
+)
 
-testEmbedBlockFromObject = {
-    "ksonsource": """
+testEmbedBlockFromObject = TestCase(
+    ksonsource="""
         embedBlock: %
             content
             %%
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedContent = """
         content
         """
     '''
-}
+)
 
-testEmbedBlockFromObject_2 = {
-    "ksonsource": """
+testEmbedBlockFromObject_2 = TestCase(
+    ksonsource="""
         embedBlock:
             embedContent: 'content\n'
             unrelatedKey: 'is not an embed block'
     """,
-    "tomlexpected": r"""
+    tomlexpected=r"""
         [embedBlock]
         embedContent = "content\n"
         unrelatedKey = "is not an embed block"
     """
-}
+)
 
-testEmbedBlockFromObjectWithoutStrings = {
-    "ksonsource": """
+testEmbedBlockFromObjectWithoutStrings = TestCase(
+    ksonsource="""
         embedBlock:
             embedContent:
             not: content
             .
             unrelatedKey: 'is not an embed block'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [embedBlock.embedContent]
         not = "content"
         
         [embedBlock]
         unrelatedKey = "is not an embed block"
     """
-}
+)
 
-testEmbeddedEmbedBlockFromObject = {
-    "ksonsource": """
+testEmbeddedEmbedBlockFromObject = TestCase(
+    ksonsource="""
         embedBlock: $
             embeddedEmbed: %
             EMBED CONTENT
             %%
             $$
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         [embedBlock]
         embedContent = """
         embeddedEmbed: %
@@ -235,17 +237,17 @@ testEmbeddedEmbedBlockFromObject = {
         %%
         """
     '''
-}
+)
 
-testEmbeddedEmbedBlockFromObject_2 = {
-    "ksonsource": """
+testEmbeddedEmbedBlockFromObject_2 = TestCase(
+    ksonsource="""
         embedBlock: %
             embeddedEmbed: $
             EMBED WITH %\\% CONTENT
             $$
             %%
     """,
-    "tomlexpected": r'''
+    tomlexpected=r'''
         [embedBlock]
         embedContent = """
         embeddedEmbed: $
@@ -253,9 +255,9 @@ testEmbeddedEmbedBlockFromObject_2 = {
         $$
         """
     '''
-}
+)
 
-all_tests = [
+all_tests = (
     testEmbedBlockSource,
     testEmbedBlockSource_2,
     testEmbedBlockSource_3,
@@ -274,4 +276,4 @@ all_tests = [
     testEmbedBlockFromObjectWithoutStrings,
     testEmbeddedEmbedBlockFromObject,
     testEmbeddedEmbedBlockFromObject_2
-]
\ No newline at end of file
+)
\ No newline at end of file
@@ -1,5 +1,7 @@
-testNestedListAndObjectFormatting = {
-    "ksonsource": """
+from tests.mocks._case import TestCase
+
+testNestedListAndObjectFormatting = TestCase(
+    ksonsource="""
     nested_obj:
         key: value
         .
@@ -7,7 +9,7 @@ testNestedListAndObjectFormatting = {
         - 1.1
         - 2.1
     """,
-    "tomlexpected": """
+    tomlexpected="""
     [nested_obj]
     key = "value"
     
@@ -16,10 +18,10 @@ testNestedListAndObjectFormatting = {
         2.1
     ]
     """
-}
+)
 
-testParsingMultiLevelMixedObjectsAndLists = {
-    "ksonsource": """
+testParsingMultiLevelMixedObjectsAndLists = TestCase(
+    ksonsource="""
     outer_key1:
         inner_key:
         - 1
@@ -28,7 +30,7 @@ testParsingMultiLevelMixedObjectsAndLists = {
         .
     outer_key2: value
     """,
-    "tomlexpected": """
+    tomlexpected="""
     [outer_key1]
     inner_key = [
         1,
@@ -38,16 +40,16 @@ testParsingMultiLevelMixedObjectsAndLists = {
     
     outer_key2 = "value"
     """
-}
+)
 
-testParsingMultiLevelMixedObjectsAndLists_2 = {
-    "ksonsource": """
+testParsingMultiLevelMixedObjectsAndLists_2 = TestCase(
+    ksonsource="""
     - 
         - inner_key: x
         =
     - outer_list_elem
     """,
-    "tomlexpected": """
+    tomlexpected="""
     [[value]]
     [[value.list_item]]
     inner_key = "x"
@@ -55,10 +57,10 @@ testParsingMultiLevelMixedObjectsAndLists_2 = {
     [[value]]
     list_item = "outer_list_elem"
     """
-}
+)
 
-all_tests = [
+all_tests = (
     testNestedListAndObjectFormatting,
     testParsingMultiLevelMixedObjectsAndLists,
     testParsingMultiLevelMixedObjectsAndLists_2,
-]
\ No newline at end of file
+)
\ No newline at end of file
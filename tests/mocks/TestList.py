@@ -1,41 +1,43 @@
-testEmptyListSource = {
-    "ksonsource": "<>",
-    "tomlexpected": "value = []"
-}
+from tests.mocks._case import TestCase
 
-testSquareBracketListSource = {
-    "ksonsource": """
+testEmptyListSource = TestCase(
+    ksonsource="<>",
+    tomlexpected="value = []"
+)
+
+testSquareBracketListSource = TestCase(
+    ksonsource="""
         - 'a string'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             "a string"
         ]
     """
-}
+)
 
-testSquareBracketListSource_2 = {
-    "ksonsource": """
+testSquareBracketListSource_2 = TestCase(
+    ksonsource="""
         - 42.4
         - 43.1
         - 44.7
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             42.4,
             43.1,
             44.7
         ]
     """
-}
+)
 
-testSquareBracketListSource_3 = {
-    "ksonsource": """
+testSquareBracketListSource_3 = TestCase(
+    ksonsource="""
         - true
         - false
         - null
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [[value]]
         item = true
         
@@ -45,10 +47,10 @@ testSquareBracketListSource_3 = {
         [[value]]
         item = "null"
     """
-}
+)
 
-testSquareBracketListSource_4 = {
-    "ksonsource": """
+testSquareBracketListSource_4 = TestCase(
+    ksonsource="""
         - true
         - false
         - 
@@ -56,7 +58,7 @@ testSquareBracketListSource_4 = {
             - 3.4
             - 5.6
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [[value]]
         item = true
         
@@ -66,76 +68,76 @@ testSquareBracketListSource_4 = {
         [[value]]
         item = [1.2, 3.4, 5.6]
     """
-}
+)
 
-testDashListSource = {
-    "ksonsource": """
+testDashListSource = TestCase(
+    ksonsource="""
         - 'a string'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             "a string"
         ]
     """
-}
+)
 
-testDashListSource_2 = {
-    "ksonsource": """
+testDashListSource_2 = TestCase(
+    ksonsource="""
         - 42.4
         - 43.1
         - 44.7
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             42.4,
             43.1,
             44.7
         ]
     """
-}
+)
 
-testDelimitedDashList = {
-    "ksonsource": "<>",
-    "tomlexpected": "value = []"
-}
+testDelimitedDashList = TestCase(
+    ksonsource="<>",
+    tomlexpected="value = []"
+)
 
-testDelimitedDashList_2 = {
-    "ksonsource": """
+testDelimitedDashList_2 = TestCase(
+    ksonsource="""
         - a
         - b
         - c
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             "a",
             "b",
             "c"
         ]
     """
-}
+)
 
-testDashListNestedWithCommaList = {
-    "ksonsource": """
+testDashListNestedWithCommaList = TestCase(
+    ksonsource="""
         - 
             - <>
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             [
                 []
             ]
         ]
     """
-}
+)
 
-testDashListNestedWithObject = {
-    "ksonsource": """
+testDashListNestedWithObject = TestCase(
+    ksonsource="""
         - nestedDashList:
             - a
             - b
             - c
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             {nestedDashList = [
                 "a",
@@ -144,10 +146,10 @@ testDashListNestedWithObject = {
             ]}
         ]
     """
-}
+)
 
-testDashListNestedWithDashList = {
-    "ksonsource": """
+testDashListNestedWithDashList = TestCase(
+    ksonsource="""
         - 
             - a
             - b
@@ -158,7 +160,7 @@ testDashListNestedWithDashList = {
             =
         - c
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             [
                 "a",
@@ -171,10 +173,10 @@ testDashListNestedWithDashList = {
             "c"
         ]
     """
-}
+)
 
-testCommaFreeList = {
-    "ksonsource": """
+testCommaFreeList = TestCase(
+    ksonsource="""
         - null
         - true
         - 
@@ -184,7 +186,7 @@ testCommaFreeList = {
             - another
             - sublist
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [[value]]
         item = "null"
         
@@ -197,25 +199,37 @@ testCommaFreeList = {
         [[value]]
         item = ["another", "sublist"]
     """
-}
+)
 
-testNestedNonDelimitedDashLists = {
-    "ksonsource": """
+testNestedNonDelimitedDashLists = TestCase(
+    ksonsource="""
         - 
             - 'sub-list elem 1'
             - 'sub-list elem 2'
             =
         - 'outer list elem 1'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = [
             ["sub-list elem 1", "sub-list elem 2"],
             "outer list elem 1"
         ]
     """
-}
+)
+
+# End-to-end check at the deepest nesting the Kson parser accepts (128 levels);
+# deeper trees are covered by deep_nesting_tests in tests/test.py
+testDeeplyNestedListSource = TestCase(
+    ksonsource="[" * 127 + "1" + "]" * 127,
+    tomlexpected=(
+        "value = [\n"
+        + "\n".join("    " * depth + "[" for depth in range(1, 126))
+        + "\n" + "    " * 126 + "[1]\n"
+        + "\n".join("    " * depth + "]" for depth in range(125, -1, -1))
+    )
+)
 
-all_tests = [
+all_tests = (
     testEmptyListSource,
     testSquareBracketListSource,
     testSquareBracketListSource_2,
@@ -229,5 +243,6 @@ all_tests = [
     testDashListNestedWithObject,
     testDashListNestedWithDashList,
     testCommaFreeList,
-    testNestedNonDelimitedDashLists
-]
\ No newline at end of file
+    testNestedNonDelimitedDashLists,
+    testDeeplyNestedListSource
+)
\ No newline at end of file
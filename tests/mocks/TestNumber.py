@@ -1,89 +1,91 @@
-testNumberLiteralSource = {
-    "ksonsource": "42",
-    "tomlexpected": "value = 42"
-}
-
-testNumberLiteralSource_float = {
-    "ksonsource": "42.1",
-    "tomlexpected": "value = 42.1"
-}
-
-testNumberLiteralSource_2 = {
-    "ksonsource": "42.1e0",
-    "tomlexpected": "value = 42.1e0"
-}
-
-testNumberLiteralSource_3 = {
-    "ksonsource": "4.21e1",
-    "tomlexpected": "value = 4.21e1"
-}
-
-testNumberLiteralSource_4 = {
-    "ksonsource": "421e-1",
-    "tomlexpected": "value = 421e-1"
-}
-
-testNumberLiteralSource_5 = {
-    "ksonsource": "4210e-2",
-    "tomlexpected": "value = 4210e-2"
-}
-
-testNumberLiteralSource_6 = {
-    "ksonsource": "0.421e2",
-    "tomlexpected": "value = 0.421e2"
-}
-
-testNumberLiteralSource_7 = {
-    "ksonsource": "0.421e+2",
-    "tomlexpected": "value = 0.421e+2"
-}
-
-testNumberLiteralSource_8 = {
-    "ksonsource": "42.1e0",
-    "tomlexpected": "value = 42.1e0"
-}
-
-testNegativeNumberLiteralSource_float = {
-    "ksonsource": "-42.1",
-    "tomlexpected": "value = -42.1"
-}
-
-testNegativeNumberLiteralSource_2 = {
-    "ksonsource": "-42.1e0",
-    "tomlexpected": "value = -42.1e0"
-}
-
-testNegativeNumberLiteralSource_3 = {
-    "ksonsource": "-4.21e1",
-    "tomlexpected": "value = -4.21e1"
-}
-
-testNegativeNumberLiteralSource_4 = {
-    "ksonsource": "-421e-1",
-    "tomlexpected": "value = -421e-1"
-}
-
-testNegativeNumberLiteralSource_5 = {
-    "ksonsource": "-4210e-2",
-    "tomlexpected": "value = -4210e-2"
-}
-
-testNegativeNumberLiteralSource_6 = {
-    "ksonsource": "-0.421e2",
-    "tomlexpected": "value = -0.421e2"
-}
-
-testNegativeNumberLiteralSource_7 = {
-    "ksonsource": "-0.421e+2",
-    "tomlexpected": "value = -0.421e+2"
-}
-
-testNegativeNumberLiteralSource_8 = {
-    "ksonsource": "-42.1e0",
-    "tomlexpected": "value = -42.1e0"
-}
-
-all_tests = [
+from tests.mocks._case import TestCase
+
+testNumberLiteralSource = TestCase(
+    ksonsource="42",
+    tomlexpected="value = 42"
+)
+
+testNumberLiteralSource_float = TestCase(
+    ksonsource="42.1",
+    tomlexpected="value = 42.1"
+)
+
+testNumberLiteralSource_2 = TestCase(
+    ksonsource="42.1e0",
+    tomlexpected="value = 42.1e0"
+)
+
+testNumberLiteralSource_3 = TestCase(
+    ksonsource="4.21e1",
+    tomlexpected="value = 4.21e1"
+)
+
+testNumberLiteralSource_4 = TestCase(
+    ksonsource="421e-1",
+    tomlexpected="value = 421e-1"
+)
+
+testNumberLiteralSource_5 = TestCase(
+    ksonsource="4210e-2",
+    tomlexpected="value = 4210e-2"
+)
+
+testNumberLiteralSource_6 = TestCase(
+    ksonsource="0.421e2",
+    tomlexpected="value = 0.421e2"
+)
+
+testNumberLiteralSource_7 = TestCase(
+    ksonsource="0.421e+2",
+    tomlexpected="value = 0.421e+2"
+)
+
+testNumberLiteralSource_8 = TestCase(
+    ksonsource="42.1e0",
+    tomlexpected="value = 42.1e0"
+)
+
+testNegativeNumberLiteralSource_float = TestCase(
+    ksonsource="-42.1",
+    tomlexpected="value = -42.1"
+)
+
+testNegativeNumberLiteralSource_2 = TestCase(
+    ksonsource="-42.1e0",
+    tomlexpected="value = -42.1e0"
+)
+
+testNegativeNumberLiteralSource_3 = TestCase(
+    ksonsource="-4.21e1",
+    tomlexpected="value = -4.21e1"
+)
+
+testNegativeNumberLiteralSource_4 = TestCase(
+    ksonsource="-421e-1",
+    tomlexpected="value = -421e-1"
+)
+
+testNegativeNumberLiteralSource_5 = TestCase(
+    ksonsource="-4210e-2",
+    tomlexpected="value = -4210e-2"
+)
+
+testNegativeNumberLiteralSource_6 = TestCase(
+    ksonsource="-0.421e2",
+    tomlexpected="value = -0.421e2"
+)
+
+testNegativeNumberLiteralSource_7 = TestCase(
+    ksonsource="-0.421e+2",
+    tomlexpected="value = -0.421e+2"
+)
+
+testNegativeNumberLiteralSource_8 = TestCase(
+    ksonsource="-42.1e0",
+    tomlexpected="value = -42.1e0"
+)
+
+all_tests = (
     testNumberLiteralSource,
     testNumberLiteralSource_float,
     testNumberLiteralSource_2,
@@ -101,4 +103,4 @@ all_tests = [
     testNegativeNumberLiteralSource_6,
     testNegativeNumberLiteralSource_7,
     testNegativeNumberLiteralSource_8
-]
\ No newline at end of file
+)
\ No newline at end of file
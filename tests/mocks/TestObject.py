@@ -1,23 +1,25 @@
-testEmptyObjectSource = {
-    "ksonsource": "{}",
-    "tomlexpected": ""
-}
+from tests.mocks._case import TestCase
 
-testObjectSource = {
-    "ksonsource": """
+testEmptyObjectSource = TestCase(
+    ksonsource="{}",
+    tomlexpected=""
+)
+
+testObjectSource = TestCase(
+    ksonsource="""
         key: val
         'string key': 66.3
         hello: "y'all"
     """,
-    "tomlexpected": """
+    tomlexpected="""
         key = "val"
         "string key" = 66.3
         hello = "y'all"
     """
-}
+)
 
-testObjectCommaPrecedence = {
-    "ksonsource": """
+testObjectCommaPrecedence = TestCase(
+    ksonsource="""
         - ObjA1: 1
         - ObjA2:
             - nested1: v
@@ -28,7 +30,7 @@ testObjectCommaPrecedence = {
         - 'A string'
         - ObjB4: 4
     """,
-    "tomlexpected": """
+    tomlexpected="""
     value = [
         {ObjA1 = 1},
         {ObjA2 = [
@@ -41,78 +43,100 @@ testObjectCommaPrecedence = {
         {ObjB4 = 4}
     ]
     """
-}
+)
 
-testObjectSourceMixedWithStringContainingRawNewlines = {
-    "ksonsource": """
+testObjectSourceMixedWithStringContainingRawNewlines = TestCase(
+    ksonsource="""
         first: value
         second: 'this is a string with a
         raw newline in it and at its end
         '
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         first = "value"
         second = """this is a string with a
         raw newline in it and at its end
         """
     '''
-}
+)
 
-testProhibitedKey = {
-    "ksonsource": """
+testProhibitedKey = TestCase(
+    ksonsource="""
         'false': 'false'
         'true': 'true'
         'null': 'null'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         "false" = "false"
         "true" = "true"
         "null" = "null"
     """
-}
+)
 
-testObjectSourceWithImmediateTrailingComment = {
-    "ksonsource": """
+testObjectSourceWithImmediateTrailingComment = TestCase(
+    ksonsource="""
         #comment
         a: b
     """,
-    "tomlexpected": """
+    tomlexpected="""
         #comment
         a = "b"
     """
-}
+)
 
-testObjectSourceOptionalCommas = {
-    "ksonsource": """
+testObjectSourceOptionalCommas = TestCase(
+    ksonsource="""
         key: val
         'string key': 66.3
         hello: "y'all"
     """,
-    "tomlexpected": """
+    tomlexpected="""
         key = "val"
         "string key" = 66.3
         hello = "y'all"
     """
-}
+)
 
-testNestedNonDelimitedObjects = {
-    "ksonsource": """
+testNestedNonDelimitedObjects = TestCase(
+    ksonsource="""
         key:
             nested_key: 10
             another_nest_key: 3
             .
         unnested_key: 44
     """,
-    "tomlexpected": """
+    tomlexpected="""
         [key]
         nested_key = 10
         another_nest_key = 3
         
         unnested_key = 44
     """
-}
+)
+
+testObjectSourceKeysNeedingQuotes = TestCase(
+    ksonsource="""
+        'dotted.key': 1
+        'señal': 2
+        'say "hi"': 3
+        plain_key: 4
+    """,
+    tomlexpected="""
+        "dotted.key" = 1
+        "señal" = 2
+        "say \\"hi\\"" = 3
+        plain_key = 4
+    """
+)
+
+# End-to-end check at the deepest nesting the Kson parser accepts (128 levels);
+# deeper trees are covered by deep_nesting_tests in tests/test.py
+testDeeplyNestedObjectSource = TestCase(
+    ksonsource="{a:" * 127 + "1" + "}" * 127,
+    tomlexpected="\n".join("[" + ".".join(["a"] * depth) + "]" for depth in range(2, 127)) + "\na = 1"
+)
 
-all_tests = [
+all_tests = (
     testEmptyObjectSource,
     testObjectSource,
     testObjectCommaPrecedence,
@@ -120,5 +144,7 @@ all_tests = [
     testProhibitedKey,
     testObjectSourceWithImmediateTrailingComment,
     testObjectSourceOptionalCommas,
-    testNestedNonDelimitedObjects
-]
\ No newline at end of file
+    testNestedNonDelimitedObjects,
+    testObjectSourceKeysNeedingQuotes,
+    testDeeplyNestedObjectSource
+)
\ No newline at end of file
@@ -1,142 +1,144 @@
-testStringLiteralSource = {
-    "ksonsource": """'This is a string'""",
-    "tomlexpected": '''value = "This is a string"'''
-}
-
-testEmptyString = {
-    "ksonsource": "''",
-    "tomlexpected": '''value = ""'''
-}
-
-testStringWithRawWhitespace = {
-    "ksonsource": f"""
+from tests.mocks._case import TestCase
+
+testStringLiteralSource = TestCase(
+    ksonsource="""'This is a string'""",
+    tomlexpected='''value = "This is a string"'''
+)
+
+testEmptyString = TestCase(
+    ksonsource="''",
+    tomlexpected='''value = ""'''
+)
+
+testStringWithRawWhitespace = TestCase(
+    ksonsource=f"""
     'This is a string with raw, unescaped whitespace ${' '}
     ${'\t'}tabbed-indented second line'
     """,
-    "tomlexpected": """
+    tomlexpected="""
     value = \"\"\"This is a string with raw, unescaped whitespace \t
 \ttabbed-indented second line\"\"\"
     """
-}
+)
 
-testStringEscapes = {
-    "ksonsource": """
+testStringEscapes = TestCase(
+    ksonsource="""
         'this\\'ll need "escaping"'
     """,
-    "tomlexpected": """
+    tomlexpected="""
     value = \"this'll need \\\"escaping\\\"\"
     """
-}
+)
 
-testBackslashEscaping = {
-    "ksonsource": """
+testBackslashEscaping = TestCase(
+    ksonsource="""
         'string with \\\\ and "'
     """,
-    "tomlexpected": r'''
+    tomlexpected=r'''
         value = 'string with \\ and "'
     '''
-}
+)
 
-testBackslashEscaping_2 = {
-    "ksonsource": """
+testBackslashEscaping_2 = TestCase(
+    ksonsource="""
         'string with \\"'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "string with \\\""
     """
-}
+)
 
-testMultipleDelimiters = {
-    "ksonsource": """
+testMultipleDelimiters = TestCase(
+    ksonsource="""
         'string \\'with\\' "quotes"'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "string 'with' \\\"quotes\\\""
     """
-}
+)
 
-testEdgeCases = {
-    "ksonsource": """
+testEdgeCases = TestCase(
+    ksonsource="""
         '""'
     """,
-    "tomlexpected": '''
+    tomlexpected='''
         value = "\\"\\""
     '''
-}
+)
 
-testEdgeCases_2 = {
-    "ksonsource": """
+testEdgeCases_2 = TestCase(
+    ksonsource="""
         '\\"\\"'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "\\\"\\\""
     """
-}
+)
 
-testBackslashSequences = {
-    "ksonsource": """
+testBackslashSequences = TestCase(
+    ksonsource="""
         '\\n'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "\\n"
     """
-}
+)
 
-testBackslashSequences_2 = {
-    "ksonsource": """
+testBackslashSequences_2 = TestCase(
+    ksonsource="""
         '\\\\'
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "\\\\"
     """
-}
+)
 
-testUnquotedNonAlphaNumericString = {
-    "ksonsource": """
+testUnquotedNonAlphaNumericString = TestCase(
+    ksonsource="""
         水滴石穿
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = "水滴石穿"
     """
-}
+)
 
-testReservedKeywordStringsAreQuoted = {
-    "ksonsource": """
+testReservedKeywordStringsAreQuoted = TestCase(
+    ksonsource="""
         Y
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = \"Y\"
     """
-}
+)
 
-testReservedKeywordStringsAreQuoted_2 = {
-    "ksonsource": """
+testReservedKeywordStringsAreQuoted_2 = TestCase(
+    ksonsource="""
         False
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = \"False\"
     """
-}
+)
 
-testReservedKeywordStringsAreQuoted_3 = {
-    "ksonsource": """
+testReservedKeywordStringsAreQuoted_3 = TestCase(
+    ksonsource="""
         Null
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = \"Null\"
     """
-}
+)
 
-testReservedKeywordStringsAreQuoted_4 = {
-    "ksonsource": """
+testReservedKeywordStringsAreQuoted_4 = TestCase(
+    ksonsource="""
         No
     """,
-    "tomlexpected": """
+    tomlexpected="""
         value = \"No\"
     """
-}
+)
 
-all_tests = [
+all_tests = (
     testStringLiteralSource,
     testEmptyString,
     testStringWithRawWhitespace,
@@ -153,4 +155,4 @@ all_tests = [
     testReservedKeywordStringsAreQuoted_2,
     testReservedKeywordStringsAreQuoted_3,
     testReservedKeywordStringsAreQuoted_4
-]
\ No newline at end of file
+)
\ No newline at end of file
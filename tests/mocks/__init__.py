@@ -0,0 +1,15 @@
+"""Mock test modules, imported lazily on first attribute access (PEP 562)"""
+import importlib
+from pathlib import Path
+
+_KNOWN_MODULES = frozenset(path.stem for path in Path(__file__).parent.glob('Test*.py'))
+
+
+def __getattr__(name):
+    if name in _KNOWN_MODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _KNOWN_MODULES)
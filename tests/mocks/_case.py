@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+import textwrap
+
+
+@dataclass(frozen=True, slots=True)
+class TestCase:
+    """A Kson source and the TOML it is expected to convert to"""
+    ksonsource: str
+    tomlexpected: str
+
+    def __post_init__(self):
+        # Dedent once at import so test runs get the strings ready to use
+        object.__setattr__(self, 'ksonsource', _norm(self.ksonsource))
+        object.__setattr__(self, 'tomlexpected', _norm(self.tomlexpected))
+
+
+def _norm(text):
+    return textwrap.dedent(text).strip('\n')
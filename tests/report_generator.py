@@ -1,108 +1,107 @@
+from collections import defaultdict
+import functools
 from datetime import datetime
 from pathlib import Path
 
-def generate_html_report(results, total, passed, failed):
-    """
-    Generate an HTML report with test results
-    """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    html_content = f"""<!DOCTYPE html>
+_HERE = Path(__file__).parent
+
+# Static prologue of the report: plain strings, so the CSS braces need no escaping
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>KSON2TOML Test Report</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background-color: white;
             padding: 30px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             border-bottom: 3px solid #4CAF50;
             padding-bottom: 10px;
-        }}
-        .summary {{
+        }
+        .summary {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .summary-card {{
+        }
+        .summary-card {
             padding: 20px;
             border-radius: 8px;
             text-align: center;
             color: white;
-        }}
-        .summary-card.total {{
+        }
+        .summary-card.total {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }}
-        .summary-card.passed {{
+        }
+        .summary-card.passed {
             background: linear-gradient(135deg, #4CAF50 0%, #45a049 100%);
-        }}
-        .summary-card.failed {{
+        }
+        .summary-card.failed {
             background: linear-gradient(135deg, #f44336 0%, #da190b 100%);
-        }}
-        .summary-card h2 {{
+        }
+        .summary-card h2 {
             margin: 0;
             font-size: 2.5em;
-        }}
-        .summary-card p {{
+        }
+        .summary-card p {
             margin: 5px 0 0 0;
             font-size: 1.1em;
-        }}
-        .test-result {{
+        }
+        .test-result {
             margin: 20px 0;
             padding: 20px;
             border-radius: 8px;
             border-left: 5px solid;
-        }}
-        .test-result.passed {{
+        }
+        .test-result.passed {
             background-color: #e8f5e9;
             border-color: #4CAF50;
-        }}
-        .test-result.failed {{
+        }
+        .test-result.failed {
             background-color: #ffebee;
             border-color: #f44336;
-        }}
-        .test-header {{
+        }
+        .test-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 15px;
-        }}
-        .test-name {{
+        }
+        .test-name {
             font-weight: bold;
             font-size: 1.2em;
             color: #333;
-        }}
-        .test-status {{
+        }
+        .test-status {
             padding: 5px 15px;
             border-radius: 20px;
             font-weight: bold;
             color: white;
-        }}
-        .test-status.passed {{
+        }
+        .test-status.passed {
             background-color: #4CAF50;
-        }}
-        .test-status.failed {{
+        }
+        .test-status.failed {
             background-color: #f44336;
-        }}
-        .test-content {{
+        }
+        .test-content {
             margin-top: 15px;
-        }}
-        .code-block {{
+        }
+        .code-block {
             background-color: #f8f8f8;
             border: 1px solid #ddd;
             border-radius: 4px;
@@ -112,43 +111,44 @@ def generate_html_report(results, total, passed, failed):
             font-family: 'Courier New', monospace;
             font-size: 0.9em;
             white-space: pre-wrap;
-        }}
-        .error-block {{
+        }
+        .error-block {
             background-color: #fff3cd;
             border: 1px solid #ffc107;
             border-radius: 4px;
             padding: 15px;
             margin: 10px 0;
             color: #856404;
-        }}
-        .section-title {{
+        }
+        .section-title {
             font-weight: bold;
             color: #555;
             margin-top: 15px;
             margin-bottom: 5px;
-        }}
-        .module-section {{
+        }
+        .module-section {
             margin-top: 40px;
-        }}
-        .module-title {{
+        }
+        .module-title {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 15px;
             border-radius: 8px;
             margin-bottom: 20px;
-        }}
-        .timestamp {{
+        }
+        .timestamp {
             color: #999;
             font-size: 0.9em;
             text-align: right;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <h1>🧪 KSON2TOML Test Report</h1>
-        <p class="timestamp">Generated: {timestamp}</p>
-        
+"""
+
+_SUMMARY_TEMPLATE = """        
         <div class="summary">
             <div class="summary-card total">
                 <h2>{total}</h2>
@@ -156,29 +156,66 @@ def generate_html_report(results, total, passed, failed):
             </div>
             <div class="summary-card passed">
                 <h2>{passed}</h2>
-                <p>Passed ({100*passed//total if total > 0 else 0}%)</p>
+                <p>Passed ({passed_pct}%)</p>
             </div>
             <div class="summary-card failed">
                 <h2>{failed}</h2>
-                <p>Failed ({100*failed//total if total > 0 else 0}%)</p>
+                <p>Failed ({failed_pct}%)</p>
             </div>
         </div>
 """
+
+# CSS class and badge text for each test outcome
+_STATUS = {True: ('passed', 'PASSED ✓'), False: ('failed', 'FAILED ✗')}
+
+
+def generate_html_report(results, total, passed, failed):
+    """
+    Generate an HTML report with test results
+    Returns the report path, or None when there are no results to report
+    """
+    if not results:
+        return None
     
-    # Group results by module
-    results_by_module = {}
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    # Group results by module, counting passes in the same pass
+    results_by_module = defaultdict(list)
+    passed_by_module = defaultdict(int)
     for result in results:
         module = result['module']
-        if module not in results_by_module:
-            results_by_module[module] = []
         results_by_module[module].append(result)
+        if result['passed']:
+            passed_by_module[module] += 1
+    
+    # Write HTML report, streaming the fragments through the file buffer
+    report_path = _HERE / 'test_report.html'
+    with open(report_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.writelines(_iter_report(timestamp, total, passed, failed,
+                                  results_by_module, passed_by_module))
+    return report_path
+
+
+def _iter_report(timestamp, total, passed, failed, results_by_module, passed_by_module):
+    """
+    Yield the HTML report fragment by fragment
+    """
+    if total > 0:
+        passed_pct = 100*passed//total
+        failed_pct = 100*failed//total
+    else:
+        passed_pct = failed_pct = 0
+    yield _HTML_HEAD
+    yield f'        <p class="timestamp">Generated: {timestamp}</p>\n'
+    yield _SUMMARY_TEMPLATE.format(total=total, passed=passed, failed=failed,
+                                   passed_pct=passed_pct, failed_pct=failed_pct)
     
     # Generate sections for each module
     for module_name, module_results in results_by_module.items():
-        module_passed = sum(1 for r in module_results if r['passed'])
+        module_passed = passed_by_module[module_name]
         module_total = len(module_results)
         
-        html_content += f"""
+        yield f"""
         <div class="module-section">
             <div class="module-title">
                 <h2>{module_name}</h2>
@@ -187,10 +224,9 @@ def generate_html_report(results, total, passed, failed):
 """
         
         for result in module_results:
-            status_class = 'passed' if result['passed'] else 'failed'
-            status_text = 'PASSED ✓' if result['passed'] else 'FAILED ✗'
+            status_class, status_text = _STATUS[bool(result['passed'])]
             
-            html_content += f"""
+            yield f"""
             <div class="test-result {status_class}">
                 <div class="test-header">
                     <div class="test-name">{result['test_name']}</div>
@@ -199,50 +235,53 @@ def generate_html_report(results, total, passed, failed):
                 
                 <div class="test-content">
                     <div class="section-title">KSON Source:</div>
-                    <div class="code-block">{html_escape(result['kson_source'])}</div>
+                    <div class="code-block">{_escape_fixture(result['kson_source'])}</div>
                     
                     <div class="section-title">Expected TOML:</div>
-                    <div class="code-block">{html_escape(result['toml_expected'])}</div>
+                    <div class="code-block">{_escape_fixture(result['toml_expected'])}</div>
 """
             
             if result['toml_generated']:
-                html_content += f"""
+                yield f"""
                     <div class="section-title">Generated TOML:</div>
                     <div class="code-block">{html_escape(result['toml_generated'])}</div>
 """
             
             if result['errors']:
-                html_content += """
+                yield """
                     <div class="section-title">Errors:</div>
                     <div class="error-block">
 """
-                for error in result['errors']:
-                    html_content += f"                        <p>{html_escape(error)}</p>\n"
-                html_content += """                    </div>
+                yield ''.join([f"                        <p>{html_escape(error)}</p>\n" for error in result['errors']])
+                yield """                    </div>
 """
             
-            html_content += """                </div>
+            yield """                </div>
             </div>
 """
         
-        html_content += """        </div>
+        yield """        </div>
 """
     
-    html_content += """    </div>
+    yield """    </div>
 </body>
 </html>"""
-    
-    # Write HTML report
-    report_path = Path(__file__).parent / 'test_report.html'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+
+
+# The Kson sources and expected TOML come from the immutable mocks, so their
+# escaped forms are reused across reports
+@functools.lru_cache(maxsize=1024, typed=True)
+def _escape_fixture(text):
+    return html_escape(text)
 
 
 def html_escape(text):
     """Escape HTML special characters"""
     if text is None:
         return ""
-    return (str(text)
+    if type(text) is not str:
+        text = str(text)
+    return (text
             .replace('&', '&amp;')
             .replace('<', '&lt;')
             .replace('>', '&gt;')
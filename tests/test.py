@@ -1,21 +1,29 @@
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from kson2toml.kson2toml import kson2toml
+_HERE = Path(__file__).parent
+sys.path.insert(0, str(_HERE.parent))
+from kson2toml.kson2toml import kson2toml, KsonParseError
+from kson2toml.ast import kson_value_to_ast, TomlArray, TomlString
+from kson import KsonValueType
 import importlib, re
+import pickle
 from colorama import Fore, Style, init
 import importlib.util
 from report_generator import generate_html_report
-import textwrap
 
 try:
-    import tomli as toml
+    import tomllib as toml  # Python 3.11+
     TomlDecodeError = (toml.TOMLDecodeError, ValueError)
-    print("Using tomli for TOML parsing (supports heterogeneous arrays)")
+    print("Using tomllib for TOML parsing (supports heterogeneous arrays)")
 except ImportError:
-    import toml
-    TomlDecodeError = toml.TomlDecodeError
-    print("Using toml library (WARNING: may not support heterogeneous arrays)")
+    try:
+        import tomli as toml
+        TomlDecodeError = (toml.TOMLDecodeError, ValueError)
+        print("Using tomli for TOML parsing (supports heterogeneous arrays)")
+    except ImportError:
+        import toml
+        TomlDecodeError = toml.TomlDecodeError
+        print("Using toml library (WARNING: may not support heterogeneous arrays)")
 
 # All tests
 
@@ -33,7 +41,7 @@ def alltests():
     """
     
     # Get all test modules from mocks folder
-    mocks_dir = Path(__file__).parent / 'mocks'
+    mocks_dir = _HERE / 'mocks'
     test_modules = []
     
     # Dynamically import all test modules
@@ -79,7 +87,7 @@ def alltests():
                 
                 # Validate tomlexpected
                 try:
-                    toml.loads(textwrap.dedent(test_case['tomlexpected']))
+                    toml.loads(test_case.tomlexpected)
                 except TomlDecodeError as e:
                     validation_errors.append({
                         'module': module_name,
@@ -132,8 +140,8 @@ def alltests():
         
         total_tests += 1
         
-        kson_source = textwrap.dedent(test_case['ksonsource'])
-        toml_expected = textwrap.dedent(test_case['tomlexpected'])
+        kson_source = test_case.ksonsource
+        toml_expected = test_case.tomlexpected
         
         # Normalize whitespace for comparison
         toml_expected_normalized = '\n'.join(
@@ -251,8 +259,37 @@ def alltests():
         
         all_results.append(result)
     
+    # ============================================================
+    # PHASE 3: Run direct checks that can't be written as mocks
+    # ============================================================
+    print("\n------------- PHASE 3: Running direct checks ---------------")
+    
+    for module_name, checks in DIRECT_CHECKS:
+        print(f"\n{'='*60}")
+        print(f"Running checks from: {module_name}")
+        print(f"{'='*60}")
+        
+        for test_name, source, errors in checks():
+            total_tests += 1
+            result = {
+                'module': module_name,
+                'test_name': test_name,
+                'kson_source': source,
+                'toml_expected': None,
+                'passed': not errors,
+                'errors': errors,
+                'toml_generated': None
+            }
+            if errors:
+                failed_tests += 1
+                printmas(f"  [FAIL] {test_name}: {errors[0]}")
+            else:
+                passed_tests += 1
+                printmas(f"  [PASS] {test_name}")
+            all_results.append(result)
+    
     # Generate HTML report
-    generate_html_report(all_results, total_tests, passed_tests, failed_tests)
+    report_path = generate_html_report(all_results, total_tests, passed_tests, failed_tests)
     
     # Print summary
     print(f"\n{'='*60}")
@@ -261,7 +298,8 @@ def alltests():
     print(f"Total tests: {total_tests}")
     print(f"Passed: {passed_tests} ({100*passed_tests//total_tests if total_tests > 0 else 0}%)")
     print(f"Failed: {failed_tests} ({100*failed_tests//total_tests if total_tests > 0 else 0}%)")
-    print(f"\nHTML report generated: {Path(__file__).parent / 'test_report.html'}")
+    if report_path is not None:
+        print(f"\nHTML report generated: {report_path}")
     
     return passed_tests == total_tests
 
@@ -272,9 +310,8 @@ def kson_totoml_validation():
     Testea la conversión de un archivo Kson a un string Toml
     """
 
-    kson_file = Path(__file__).parent / 'fibonacci_sequence.kson'
-    with open(kson_file, 'r') as f:
-        kson_string = f.read()
+    kson_file = _HERE / 'fibonacci_sequence.kson'
+    kson_string = kson_file.read_text(encoding='utf-8')
 
     result = kson2toml(kson_string)
     print("Resultado de la conversión:")
@@ -296,6 +333,133 @@ def kson_totoml_validation():
         printmas("[FAIL] Error inesperado al validar el TOML")
         print(f"  - {type(e).__name__}: {e}")
         return False
+
+
+# Deep nesting tests
+
+# Far beyond both the parser's 128-level limit and the default recursion limit
+DEEP_NESTING_DEPTH = 2000
+
+class _StubValue:
+    """
+    Minimal KsonValue stand-in, to build trees deeper than the parser accepts
+    """
+    def __init__(self, value_type, children=None):
+        self._value_type = value_type
+        self._children = children
+
+    def value_type(self):
+        return self._value_type
+
+    def value(self):
+        return "leaf"
+
+    def elements(self):
+        return self._children
+
+    def properties(self):
+        return self._children
+
+    def start(self):
+        return None
+
+    def end(self):
+        return None
+
+
+def _nested_stub(depth, kinds):
+    """Wrap a string leaf in `depth` containers, cycling through `kinds`"""
+    value = _StubValue(KsonValueType.STRING)
+    for level in range(depth):
+        if kinds[level % len(kinds)] == KsonValueType.ARRAY:
+            value = _StubValue(KsonValueType.ARRAY, [value])
+        else:
+            value = _StubValue(KsonValueType.OBJECT, {'a': value})
+    return value
+
+
+def _walk_depth(node):
+    """Count the containers above the string leaf of a single-chain AST"""
+    depth = 0
+    while not isinstance(node, TomlString):
+        node = node.elements[0] if isinstance(node, TomlArray) else node.properties['a']
+        depth += 1
+    return depth
+
+
+def deep_nesting_checks():
+    """
+    Convert KsonValue trees nested DEEP_NESTING_DEPTH levels with kson_value_to_ast,
+    which a recursive builder could not do without a RecursionError.
+    Yields (test name, source description, errors) for each tree
+    """
+    cases = [
+        ('testDeepNestingObjects', (KsonValueType.OBJECT,)),
+        ('testDeepNestingArrays', (KsonValueType.ARRAY,)),
+        ('testDeepNestingObjectsAndArrays', (KsonValueType.OBJECT, KsonValueType.ARRAY)),
+    ]
+    
+    for test_name, kinds in cases:
+        source = f"<{DEEP_NESTING_DEPTH}-level stub KsonValue: {', '.join(kind.name for kind in kinds)}>"
+        errors = []
+        try:
+            node = kson_value_to_ast(_nested_stub(DEEP_NESTING_DEPTH, kinds))
+            if isinstance(node, TomlArray):
+                # The element type masks must not recurse through the nesting either
+                node.check_heterogeneous()
+                node.needs_array_of_tables_format()
+            depth = _walk_depth(node)
+            # Walking back down checks no level was lost
+            if depth != DEEP_NESTING_DEPTH:
+                errors.append(f"AST has {depth} levels, expected {DEEP_NESTING_DEPTH}")
+        except RecursionError:
+            errors.append("RecursionError while building or inspecting the AST")
+        yield test_name, source, errors
+
+
+# Parse error tests
+
+PARSE_ERROR_SOURCE = "{a: "
+
+def parse_error_checks():
+    """
+    Check the KsonParseError raised for an invalid Kson document.
+    Yields (test name, source, errors) for each property checked
+    """
+    expected_errors = ["Unclosed object", "This object key must be followed by a value"]
+    expected_message = "Failed to parse Kson:\n" + "\n".join(f"Error: {message}" for message in expected_errors)
+    try:
+        kson2toml(PARSE_ERROR_SOURCE)
+    except KsonParseError as e:
+        error = e
+    else:
+        yield 'testParseErrorRaised', PARSE_ERROR_SOURCE, ["No KsonParseError raised"]
+        return
+    
+    checks = [
+        ('testParseErrorIsValueError', isinstance(error, ValueError), f"{type(error).__mro__} has no ValueError"),
+        ('testParseErrorStr', str(error) == expected_message, f"str(error) is {str(error)!r}"),
+        ('testParseErrorArgs', error.args == (expected_message,), f"error.args is {error.args!r}"),
+        ('testParseErrorErrors', error.errors == expected_errors, f"error.errors is {error.errors!r}"),
+    ]
+    for test_name, ok, failure in checks:
+        yield test_name, PARSE_ERROR_SOURCE, [] if ok else [failure]
+    
+    try:
+        restored = pickle.loads(pickle.dumps(error))
+    except Exception as e:
+        yield 'testParseErrorPickle', PARSE_ERROR_SOURCE, [f"Pickle round trip failed: {type(e).__name__}: {e}"]
+        return
+    ok = (type(restored) is KsonParseError and restored.args == error.args
+          and restored.errors == error.errors)
+    yield 'testParseErrorPickle', PARSE_ERROR_SOURCE, [] if ok else [f"Pickle round trip gave {restored!r}"]
+
+
+# Checks run by alltests after the mocks, as (module name, check generator)
+DIRECT_CHECKS = [
+    ('DeepNesting', deep_nesting_checks),
+    ('ParseError', parse_error_checks),
+]
     
 init(autoreset=True)
 